@@ -0,0 +1,211 @@
+# alloctrace.py
+from __future__ import annotations
+
+import fnmatch
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Our own bookkeeping (snapshot filtering compiles fnmatch patterns) and the import
+# machinery are not what we're looking for.
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, fnmatch.__file__),
+    tracemalloc.Filter(False, "*/re/*"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class _StateStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.frames = 0
+        self.blocks = 0          # net allocated blocks over all frames
+        self.peak_sum = 0        # sum of per-frame transient peaks (bytes)
+        self.peak_max = 0
+        self.collections = [0, 0, 0]
+        self.gc_time = 0.0
+        self.gc_max = 0.0
+        # Line -> (bytes, blocks) allocated and still alive at each sample point.
+        self.lines: dict[str, list[int]] = {}
+
+
+class AllocTracer:
+    """
+    Allocation capture mode (F9 or --trace-alloc).
+
+    Every frame records, per state type: how many blocks were left allocated, how far
+    memory peaked above the frame's starting point (the transient garbage a frame
+    churns through), and which GC generations ran and for how long (via gc.callbacks).
+    Every `sample_every` frames a tracemalloc snapshot is diffed against the previous
+    one to attribute growth to source lines; garbage created and freed in between is
+    only visible in the per-frame peaks, not in the line attribution. stop() writes a
+    text report plus one CSV row per frame, so allocation counts can be tracked as a
+    metric over time. Each tracing session gets its own timestamped pair of files.
+    """
+    def __init__(self, report_path: str, sample_every: int = 120, top: int = 12) -> None:
+        self.report_path = report_path
+        self.sample_every = sample_every
+        self.top = top
+        self.active = False
+        self.session_path = report_path
+        self._sessions = 0
+
+        self._stats: dict[str, _StateStats] = {}
+        self._rows: list[tuple] = []
+        self._current: _StateStats | None = None
+        self._frame = 0
+        self._frame_blocks = 0
+        self._frame_start_mem = 0
+        self._frame_gc = [0, 0, 0]
+        self._frame_gc_time = 0.0
+        self._frame_gc_max = 0.0
+        self._gc_started = 0.0
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    # ---------- control ----------
+
+    def toggle(self) -> None:
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+
+    def start(self) -> None:
+        if self.active:
+            return
+        self.active = True
+        self._stats.clear()
+        self._rows.clear()
+        self._current = None
+        self._frame = 0
+        self._sessions += 1
+        stem, ext = os.path.splitext(self.report_path)
+        self.session_path = f"{stem}-{time.strftime('%Y%m%d-%H%M%S')}-{self._sessions}{ext}"
+        tracemalloc.start()
+        gc.callbacks.append(self._on_gc)
+        self._snapshot = self._take_snapshot()
+        print(f"[alloc] tracing started (report -> {self.session_path})")
+
+    def stop(self) -> None:
+        if not self.active:
+            return
+        self.active = False
+        gc.callbacks.remove(self._on_gc)
+        self._sample()
+        tracemalloc.stop()
+        self._snapshot = None
+        self._write_report()
+        print(f"[alloc] tracing stopped, report written to {self.session_path}")
+
+    # ---------- per frame ----------
+
+    def begin_frame(self, state: object) -> None:
+        if not self.active:
+            return
+        name = type(state).__name__
+        if self._current is None or self._current.name != name:
+            # New state: start its line attribution from a fresh baseline.
+            self._sample()
+            self._current = self._stats.setdefault(name, _StateStats(name))
+        self._frame_blocks = sys.getallocatedblocks()
+        tracemalloc.reset_peak()
+        self._frame_start_mem = tracemalloc.get_traced_memory()[0]
+        self._frame_gc = [0, 0, 0]
+        self._frame_gc_time = 0.0
+        self._frame_gc_max = 0.0
+
+    def end_frame(self) -> None:
+        if not self.active or self._current is None:
+            return
+        peak = tracemalloc.get_traced_memory()[1] - self._frame_start_mem
+        blocks = sys.getallocatedblocks() - self._frame_blocks
+
+        s = self._current
+        s.frames += 1
+        s.blocks += blocks
+        s.peak_sum += peak
+        s.peak_max = max(s.peak_max, peak)
+        for gen in range(3):
+            s.collections[gen] += self._frame_gc[gen]
+        s.gc_time += self._frame_gc_time
+        s.gc_max = max(s.gc_max, self._frame_gc_max)
+
+        self._rows.append((self._frame, s.name, blocks, peak, *self._frame_gc,
+                           round(self._frame_gc_time * 1000, 3)))
+        self._frame += 1
+        if self._frame % self.sample_every == 0:
+            self._sample()
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+            return
+        took = time.perf_counter() - self._gc_started
+        self._frame_gc[info["generation"]] += 1
+        self._frame_gc_time += took
+        self._frame_gc_max = max(self._frame_gc_max, took)
+
+    # ---------- attribution ----------
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def _sample(self) -> None:
+        if self._snapshot is None:
+            return
+        snap = self._take_snapshot()
+        if self._current is not None:
+            lines = self._current.lines
+            for diff in snap.compare_to(self._snapshot, "lineno"):
+                if diff.count_diff <= 0:
+                    continue
+                frame = diff.traceback[0]
+                key = f"{frame.filename}:{frame.lineno}"
+                entry = lines.setdefault(key, [0, 0])
+                entry[0] += diff.size_diff
+                entry[1] += diff.count_diff
+        self._snapshot = snap
+
+    # ---------- output ----------
+
+    def _write_report(self) -> None:
+        lines = [
+            "Allocation trace",
+            "",
+            "Per frame: net blocks left allocated, and the transient peak above the frame's",
+            "starting memory (short-lived garbage). Line attribution diffs snapshots taken",
+            "every few frames, so it shows where memory grew between samples, not churn",
+            "that was allocated and freed in between.",
+            "",
+        ]
+        for s in self._stats.values():
+            if not s.frames:
+                continue
+            lines.append(f"{s.name}: {s.frames} frames")
+            lines.append(f"  net blocks/frame      {s.blocks / s.frames:10.1f}")
+            lines.append(f"  transient peak/frame  {s.peak_sum / s.frames / 1024:10.1f} KiB "
+                         f"(max {s.peak_max / 1024:.1f} KiB)")
+            lines.append(f"  gc collections        gen0 {s.collections[0]}, "
+                         f"gen1 {s.collections[1]}, gen2 {s.collections[2]}")
+            lines.append(f"  gc pause              {s.gc_time * 1000:10.2f} ms total, "
+                         f"{s.gc_max * 1000:.2f} ms max")
+            lines.append("  top growing lines (bytes, blocks):")
+            top = sorted(s.lines.items(), key=lambda kv: -kv[1][1])[:self.top]
+            for where, (size, count) in top:
+                lines.append(f"    {size:>10} {count:>7}  {where}")
+            lines.append("")
+
+        with open(self.session_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+        csv_path = os.path.splitext(self.session_path)[0] + ".csv"
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write("frame,state,net_blocks,peak_bytes,gc0,gc1,gc2,gc_ms\n")
+            for row in self._rows:
+                f.write(",".join(str(v) for v in row) + "\n")
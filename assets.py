@@ -1,21 +1,154 @@
 # assets.py
 from __future__ import annotations
 
+import io
 import os
+import time
 import pygame
 
+import telemetry
+
+from bundle import BundleReader
+from settings import SPRITE_FORMAT, SPRITE_BINARY_ALPHA, PALETTE_MIN_PIXELS, PALETTE_MAX_PIXELS
+
 _IMAGE_CACHE: dict[tuple, pygame.Surface] = {}
 _FONT_CACHE: dict[tuple, pygame.font.Font] = {}
+# Surface format picked for each cached image (same keys as _IMAGE_CACHE).
+_IMAGE_FORMATS: dict[tuple, str] = {}
+# Collision masks, keyed exactly like the image they were built from.
+_MASK_CACHE: dict[tuple, pygame.mask.Mask] = {}
+
+# Optional packed asset bundle; when mounted it is consulted before the local files.
+_BUNDLE: BundleReader | None = None
 
 
 def _assert_pygame_ready() -> None:
-    if not pygame.get_init():
-        raise RuntimeError("Pygame is not initialized. Call pygame.init() before loading assets.")
+    # main() only starts display and font (the mixer is started lazily by audio.py).
+    if not pygame.display.get_init():
+        raise RuntimeError("The pygame display is not initialized. "
+                           "Call pygame.display.init() before loading assets.")
+
+
+def mount_bundle(path: str) -> bool:
+    """
+    Serves assets from a bundle built by bundle.py. Entries are read lazily, so mounting
+    only costs the index. Returns False (and keeps using local files) if there is none.
+    """
+    global _BUNDLE
+    if not os.path.exists(path):
+        return False
+    unmount_bundle()
+    _BUNDLE = BundleReader.open(path)
+    return True
+
+
+def unmount_bundle() -> None:
+    global _BUNDLE
+    if _BUNDLE is not None:
+        _BUNDLE.close()
+        _BUNDLE = None
+
+
+def prefetch_group(group: str) -> None:
+    """Reads a bundle group's bytes ahead of time (no-op without a bundle)."""
+    if _BUNDLE is not None:
+        _BUNDLE.prefetch_group(group)
+
+
+def _bundled(path: str) -> io.BytesIO | None:
+    if _BUNDLE is None or path not in _BUNDLE:
+        return None
+    return io.BytesIO(_BUNDLE.read(path))
+
+
+def open_asset(path: str) -> io.BytesIO | str:
+    """The bundled bytes of `path` if it is in the bundle, else the local path itself."""
+    data = _bundled(path)
+    if data is not None:
+        return data
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Missing asset file: {path}")
+    return path
+
+
+# Surface formats load_image can pick for a sprite (see _choose_format).
+FORMAT_OPAQUE = "opaque"      # no transparency at all: plain display-format copy
+FORMAT_COLORKEY = "colorkey"  # binary alpha: colorkey + RLE, the cheapest blit
+FORMAT_PAL8 = "pal8"          # binary alpha, big, <= 255 colors: 8-bit palette + RLE
+FORMAT_ALPHA = "alpha"        # real soft edges: per-pixel alpha
+
+_COLORKEYS = ((255, 0, 255), (0, 255, 0), (1, 254, 3), (254, 1, 253))
+
+
+def _is_binary_alpha(img: pygame.Surface) -> bool:
+    """True if almost every visible pixel is fully opaque (soft edges are rare)."""
+    visible = pygame.mask.from_surface(img, 15).count()
+    if visible == 0:
+        return False
+    solid = pygame.mask.from_surface(img, 239).count()
+    return visible - solid <= SPRITE_BINARY_ALPHA * visible
+
+
+def _to_colorkey(img: pygame.Surface) -> pygame.Surface | None:
+    solid = pygame.mask.from_surface(img, 127)
+    out = img.convert()
+    for key in _COLORKEYS:
+        clash = pygame.mask.from_threshold(out, key, (1, 1, 1, 255))
+        if clash.overlap_area(solid, (0, 0)) == 0:
+            break
+    else:
+        return None
+    holes = solid.copy()
+    holes.invert()
+    holes.to_surface(out, setcolor=key, unsetcolor=None)
+    out.set_colorkey(key, pygame.RLEACCEL)
+    return out
+
+
+def _to_pal8(img: pygame.Surface) -> pygame.Surface | None:
+    w, h = img.get_size()
+    if not PALETTE_MIN_PIXELS <= w * h <= PALETTE_MAX_PIXELS:
+        return None
+
+    data = pygame.image.tobytes(img, "RGBA")
+    palette: dict[tuple[int, int, int], int] = {}
+    indices = bytearray(w * h)
+    for i, (r, g, b, a) in enumerate(zip(data[0::4], data[1::4], data[2::4], data[3::4])):
+        if a < 128:
+            continue  # index 0 is the transparent colorkey
+        idx = palette.get((r, g, b))
+        if idx is None:
+            if len(palette) == 255:
+                return None
+            idx = palette[(r, g, b)] = len(palette) + 1
+        indices[i] = idx
+
+    out = pygame.image.frombytes(bytes(indices), (w, h), "P")
+    out.set_palette([(0, 0, 0)] + list(palette))
+    out.set_colorkey(0, pygame.RLEACCEL)
+    return out
+
+
+def _choose_format(img: pygame.Surface, binary: bool) -> tuple[pygame.Surface, str]:
+    """Cheapest representation that still looks the same as the alpha version."""
+    if not binary:
+        return img, FORMAT_ALPHA
+    w, h = img.get_size()
+    if pygame.mask.from_surface(img, 239).count() == w * h:
+        return img.convert(), FORMAT_OPAQUE
+    pal = _to_pal8(img)
+    if pal is not None:
+        return pal, FORMAT_PAL8
+    keyed = _to_colorkey(img)
+    if keyed is not None:
+        return keyed, FORMAT_COLORKEY
+    return img, FORMAT_ALPHA
 
 
 def load_image(path: str,
                scale_to: tuple[int, int] | None = None,
-               convert_alpha: bool = True) -> pygame.Surface:
+               convert_alpha: bool = True,
+               fmt: str = SPRITE_FORMAT) -> pygame.Surface:
     """
     Loads an image from disk with caching.
 
@@ -23,29 +156,74 @@ def load_image(path: str,
         path: relative/absolute path to image
         scale_to: (w,h) if you want to force a size
         convert_alpha: True preserves transparency nicely (PNG sprites)
+        fmt: "auto" picks colorkey/palette/alpha per image, "alpha" always keeps alpha
 
     Returns:
         pygame.Surface
     """
     _assert_pygame_ready()
 
-    key = (path, scale_to, convert_alpha)
+    key = (path, scale_to, convert_alpha, fmt)
     if key in _IMAGE_CACHE:
         return _IMAGE_CACHE[key]
 
-    if not os.path.exists(path):
+    started = time.perf_counter()
+    data = _bundled(path)
+    if data is not None:
+        img = pygame.image.load(data, path)
+    elif not os.path.exists(path):
         raise FileNotFoundError(f"Missing image file: {path}")
+    else:
+        img = pygame.image.load(path)
 
-    img = pygame.image.load(path)
-    img = img.convert_alpha() if convert_alpha else img.convert()
+    if not convert_alpha:
+        img = img.convert()
+        chosen = FORMAT_OPAQUE
+    else:
+        img = img.convert_alpha()
+        # Judge the source art: scaling down softens every edge, the art itself doesn't.
+        binary = fmt == "auto" and _is_binary_alpha(img)
+        chosen = FORMAT_ALPHA
 
     if scale_to is not None:
         img = pygame.transform.smoothscale(img, scale_to)
 
+    if convert_alpha:
+        img, chosen = _choose_format(img, binary)
+
     _IMAGE_CACHE[key] = img
+    _IMAGE_FORMATS[key] = chosen
+    telemetry.emit("asset_load", path=path, fmt=chosen,
+                   ms=round((time.perf_counter() - started) * 1000, 2))
     return img
 
 
+def image_stats() -> dict[str, tuple[int, int]]:
+    """(count, bytes) of cached images per chosen surface format."""
+    stats: dict[str, tuple[int, int]] = {}
+    for key, img in _IMAGE_CACHE.items():
+        fmt = _IMAGE_FORMATS.get(key, FORMAT_ALPHA)
+        count, total = stats.get(fmt, (0, 0))
+        stats[fmt] = (count + 1, total + img.get_pitch() * img.get_height())
+    return stats
+
+
+def load_mask(path: str,
+              scale_to: tuple[int, int] | None = None,
+              convert_alpha: bool = True,
+              fmt: str = SPRITE_FORMAT) -> pygame.mask.Mask:
+    """
+    Per-pixel collision mask for the image load_image would return with the same
+    arguments. Built once and cached next to the image.
+    """
+    key = (path, scale_to, convert_alpha, fmt)
+    mask = _MASK_CACHE.get(key)
+    if mask is None:
+        mask = pygame.mask.from_surface(load_image(path, scale_to, convert_alpha, fmt))
+        _MASK_CACHE[key] = mask
+    return mask
+
+
 def load_font(path: str | None, size: int) -> pygame.font.Font:
     """
     Loads a TTF font with caching. If path is None or missing, falls back to pygame default.
@@ -56,7 +234,10 @@ def load_font(path: str | None, size: int) -> pygame.font.Font:
     if key in _FONT_CACHE:
         return _FONT_CACHE[key]
 
-    if path is None or (isinstance(path, str) and not os.path.exists(path)):
+    data = _bundled(path) if path is not None else None
+    if data is not None:
+        font = pygame.font.Font(data, size)
+    elif path is None or (isinstance(path, str) and not os.path.exists(path)):
         font = pygame.font.Font(None, size)
     else:
         font = pygame.font.Font(path, size)
@@ -65,7 +246,29 @@ def load_font(path: str | None, size: int) -> pygame.font.Font:
     return font
 
 
+def evict_image(path: str) -> int:
+    """Drops every cached variant (size/format) of one image. Returns how many."""
+    keys = [k for k in _IMAGE_CACHE if k[0] == path]
+    for k in keys:
+        del _IMAGE_CACHE[k]
+        _IMAGE_FORMATS.pop(k, None)
+        _MASK_CACHE.pop(k, None)
+    return len(keys)
+
+
+def cached_image_paths() -> set[str]:
+    """Every file the image cache holds at least one variant of."""
+    return {k[0] for k in _IMAGE_CACHE}
+
+
+def cached_images() -> list[pygame.Surface]:
+    """Surfaces currently held by the image cache (used by the memory report)."""
+    return list(_IMAGE_CACHE.values())
+
+
 def clear_asset_cache() -> None:
     """If you ever reload assets during dev."""
     _IMAGE_CACHE.clear()
+    _IMAGE_FORMATS.clear()
+    _MASK_CACHE.clear()
     _FONT_CACHE.clear()
@@ -0,0 +1,149 @@
+# audio.py
+from __future__ import annotations
+
+import sys
+import time
+
+import pygame
+
+from assets import open_asset
+from settings import (
+    SOUND_FILES,
+    AUDIO_FREQUENCY, AUDIO_BUFFER, AUDIO_CHANNELS,
+    SFX_VOLUME, AMBIENCE_VOLUME,
+)
+
+# Decoded sound effects by name; None marks a sound that failed to load (it stays
+# silent instead of hitting the disk again every time it is played).
+_SOUND_CACHE: dict[str, pygame.mixer.Sound | None] = {}
+# Names asked for before the mixer was up; decoded as soon as it starts.
+_PENDING: set[str] = set()
+
+# Our fixed voice pool and, per channel, (priority, start time) of what it plays.
+_CHANNELS: list[pygame.mixer.Channel] = []
+_VOICES: list[tuple[int, float]] = []
+
+_READY = False
+_FAILED = False
+# Ambience track the game wants, and the one mixer.music is actually playing.
+_AMBIENCE: str | None = None
+_PLAYING: str | None = None
+
+
+def _ensure_mixer() -> bool:
+    """
+    Starts the mixer on first use. pygame.init() is not called at startup, so a game
+    that never makes a sound never pays for audio device setup. In the browser this
+    must happen inside a user gesture (see unlock()).
+    """
+    global _READY, _FAILED
+    if _READY:
+        return True
+    if _FAILED:
+        return False
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER)
+        pygame.mixer.set_num_channels(AUDIO_CHANNELS)
+        pygame.mixer.set_reserved(AUDIO_CHANNELS)
+    except pygame.error as e:
+        print(f"Audio disabled: {e}")
+        _FAILED = True
+        return False
+
+    _CHANNELS[:] = [pygame.mixer.Channel(i) for i in range(AUDIO_CHANNELS)]
+    _VOICES[:] = [(0, 0.0)] * AUDIO_CHANNELS
+    _READY = True
+
+    for name in sorted(_PENDING):
+        _load(name)
+    _PENDING.clear()
+    if _AMBIENCE is not None:
+        play_ambience(_AMBIENCE)
+    return True
+
+
+def unlock() -> None:
+    """Call on a user gesture (key / click / touch). Cheap after the first time."""
+    if not _READY:
+        _ensure_mixer()
+
+
+def _load(name: str) -> pygame.mixer.Sound | None:
+    if name in _SOUND_CACHE:
+        return _SOUND_CACHE[name]
+    path = SOUND_FILES.get(name)
+    sound = None
+    if path is not None:
+        try:
+            sound = pygame.mixer.Sound(open_asset(path))
+            sound.set_volume(SFX_VOLUME)
+        except (FileNotFoundError, pygame.error):
+            sound = None
+    _SOUND_CACHE[name] = sound
+    return sound
+
+
+def preload(names: list[str]) -> None:
+    """Decodes sounds ahead of time (e.g. while a level loads) so play() never does."""
+    if _READY:
+        for name in names:
+            _load(name)
+    else:
+        _PENDING.update(names)
+
+
+def play(name: str, priority: int = 0) -> None:
+    """
+    Plays a sound effect on the voice pool. With every voice busy, the oldest sound of
+    equal or lower priority is cut off; if there is none, this one is skipped.
+    """
+    if not _READY:
+        # On desktop the first sound may start the mixer; the browser needs a gesture.
+        if sys.platform == "emscripten" or not _ensure_mixer():
+            return
+    sound = _load(name)
+    if sound is None:
+        return
+
+    victim = -1
+    for i, channel in enumerate(_CHANNELS):
+        if not channel.get_busy():
+            victim = i
+            break
+        if _VOICES[i][0] <= priority and (victim < 0 or _VOICES[i][1] < _VOICES[victim][1]):
+            victim = i
+    if victim < 0:
+        return
+    _CHANNELS[victim].play(sound)
+    _VOICES[victim] = (priority, time.monotonic())
+
+
+def play_ambience(path: str | None, fade_ms: int = 800) -> None:
+    """
+    Loops a background track, streamed and decoded on the fly by mixer.music instead of
+    being decoded into memory. Passing the current track again keeps it playing.
+    """
+    global _AMBIENCE, _PLAYING
+    _AMBIENCE = path
+    if not _READY or path == _PLAYING:
+        return
+    if path is None:
+        stop_ambience(fade_ms)
+        return
+    try:
+        pygame.mixer.music.load(open_asset(path))
+    except (FileNotFoundError, pygame.error):
+        _PLAYING = None
+        return
+    pygame.mixer.music.set_volume(AMBIENCE_VOLUME)
+    pygame.mixer.music.play(loops=-1, fade_ms=fade_ms)
+    _PLAYING = path
+
+
+def stop_ambience(fade_ms: int = 800) -> None:
+    global _AMBIENCE, _PLAYING
+    _AMBIENCE = None
+    if _READY and _PLAYING is not None:
+        pygame.mixer.music.fadeout(fade_ms)
+    _PLAYING = None
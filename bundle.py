@@ -0,0 +1,202 @@
+# bundle.py
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import zlib
+from typing import BinaryIO
+
+# ----------------------------
+# Asset bundle format (.rrb)
+# ----------------------------
+# magic (4 bytes) | index length (u32, little endian) | index (JSON) | blobs
+#
+# The index lists every entry with its group, codec and byte range relative to the
+# start of the blob area. Groups are written in load order ("title" first), so the
+# assets one screen needs sit together and prefetching a group is one sequential read.
+# The bundle is a single local file: it saves opening hundreds of loose files, not
+# download size (the PNGs are already deflated, zlib wins back only a few percent).
+
+MAGIC = b"RRB1"
+_HEADER = struct.Struct("<4sI")
+
+CODEC_STORE = "store"
+CODEC_ZLIB = "zlib"
+
+# Compressed blobs must save at least this fraction, otherwise we store them raw
+# (PNGs are already deflated, so recompressing most of them is wasted decode time).
+MIN_SAVING = 0.02
+
+
+def normalize(path: str) -> str:
+    return os.path.normpath(path).replace("\\", "/")
+
+
+class BundleReader:
+    """
+    Random-access reader for a bundle. Only the header and index are read on open;
+    entries are fetched and decompressed one at a time when asked for.
+    """
+    def __init__(self, stream: BinaryIO, name: str = "<bundle>") -> None:
+        self.name = name
+        self._stream = stream
+
+        magic, index_len = _HEADER.unpack(stream.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Not an asset bundle: {name}")
+        index = json.loads(stream.read(index_len).decode("utf-8"))
+
+        self._data_start = _HEADER.size + index_len
+        self.groups: list[str] = list(index["groups"])
+        self.entries: dict[str, dict] = {e["path"]: e for e in index["entries"]}
+        self._fetched: dict[str, bytes] = {}
+
+    @classmethod
+    def open(cls, path: str) -> "BundleReader":
+        return cls(open(path, "rb"), name=path)
+
+    def close(self) -> None:
+        self._fetched.clear()
+        self._stream.close()
+
+    def __contains__(self, path: str) -> bool:
+        return normalize(path) in self.entries
+
+    def group_paths(self, group: str) -> list[str]:
+        return [p for p, e in self.entries.items() if e["group"] == group]
+
+    def fetch(self, path: str) -> bytes:
+        """Returns the still-compressed blob for `path`, reading it once."""
+        path = normalize(path)
+        blob = self._fetched.get(path)
+        if blob is None:
+            entry = self.entries[path]
+            self._stream.seek(self._data_start + entry["offset"])
+            blob = self._stream.read(entry["size"])
+            if len(blob) != entry["size"]:
+                raise EOFError(f"Truncated bundle entry {path} in {self.name}")
+            self._fetched[path] = blob
+        return blob
+
+    def prefetch_group(self, group: str) -> None:
+        """
+        Reads a group's blobs ahead of time. Blobs an earlier prefetch pulled in that
+        were never read (assets the game ended up not needing) are dropped first, so at
+        most one group waits in memory.
+        """
+        paths = set(self.group_paths(group))
+        for path in [p for p in self._fetched if p not in paths]:
+            del self._fetched[path]
+        for path in paths:
+            self.fetch(path)
+
+    def read(self, path: str) -> bytes:
+        """Returns the decoded bytes for `path` and drops the fetched blob."""
+        path = normalize(path)
+        entry = self.entries[path]
+        blob = self.fetch(path)
+        self._fetched.pop(path, None)
+        if entry["codec"] == CODEC_ZLIB:
+            return zlib.decompress(blob)
+        return blob
+
+
+def write_bundle(out_path: str, groups: dict[str, list[str]]) -> dict:
+    """
+    Writes a bundle from local files. `groups` maps group name -> asset paths, in the
+    order they should be streamed. A path listed in several groups is stored once,
+    in the first group that asks for it. Returns the index that was written.
+    """
+    entries: list[dict] = []
+    blobs: list[bytes] = []
+    seen: set[str] = set()
+    offset = 0
+
+    for group, paths in groups.items():
+        for path in paths:
+            key = normalize(path)
+            if key in seen or not os.path.exists(path):
+                continue
+            seen.add(key)
+
+            with open(path, "rb") as f:
+                raw = f.read()
+            packed = zlib.compress(raw, 9)
+            if len(packed) <= len(raw) * (1.0 - MIN_SAVING):
+                codec, blob = CODEC_ZLIB, packed
+            else:
+                codec, blob = CODEC_STORE, raw
+
+            entries.append({
+                "path": key,
+                "group": group,
+                "codec": codec,
+                "offset": offset,
+                "size": len(blob),
+                "raw_size": len(raw),
+            })
+            blobs.append(blob)
+            offset += len(blob)
+
+    index = {"version": 1, "groups": list(groups), "entries": entries}
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    return index
+
+
+def default_groups() -> dict[str, list[str]]:
+    """Groups the game's assets by the screen that first needs them."""
+    from settings import ASSETS_DIR, TITLE_BG, END_BG, FONTS_DIR, PLAYER_SPRITES, SOUND_FILES
+    from game.level_data import LEVELS
+
+    groups: dict[str, list[str]] = {"title": [TITLE_BG]}
+    if os.path.isdir(FONTS_DIR):
+        groups["title"] += sorted(os.path.join(FONTS_DIR, n) for n in os.listdir(FONTS_DIR))
+    # Effects are decoded when audio starts (first input on the title screen).
+    groups["title"] += list(SOUND_FILES.values())
+
+    for level_id in sorted(LEVELS):
+        cfg = LEVELS[level_id]
+        paths = [cfg["map_path"]]
+        # A chunked map is its manifest plus one PNG per chunk.
+        directory = cfg.get("map_chunks")
+        if directory and os.path.isdir(directory):
+            paths += sorted(os.path.join(directory, n) for n in os.listdir(directory)
+                            if n.lower().endswith((".json", ".png")))
+        if level_id == min(LEVELS):
+            paths += list(PLAYER_SPRITES.values())
+        paths += list(cfg.get("item_assets", {}).values())
+        paths += [so["image"] for so in cfg.get("static_objects", [])]
+        paths += [mo["image"] for mo in cfg.get("moving_objects", [])]
+        groups[f"level{level_id}"] = paths
+
+    groups["end"] = [END_BG]
+
+    # Anything else under assets/ still goes in, at the back.
+    extra: list[str] = []
+    for root, _dirs, files in os.walk(ASSETS_DIR):
+        for name in sorted(files):
+            if name.lower().endswith((".png", ".ttf", ".otf", ".ogg", ".wav")):
+                extra.append(os.path.join(root, name))
+    groups["extra"] = sorted(extra)
+    return groups
+
+
+if __name__ == "__main__":
+    from settings import ASSET_BUNDLE
+
+    out = sys.argv[1] if len(sys.argv) > 1 else ASSET_BUNDLE
+    index = write_bundle(out, default_groups())
+    raw = sum(e["raw_size"] for e in index["entries"])
+    packed = sum(e["size"] for e in index["entries"])
+    print(f"{out}: {len(index['entries'])} assets, {raw} -> {packed} bytes")
+    for group in index["groups"]:
+        size = sum(e["size"] for e in index["entries"] if e["group"] == group)
+        print(f"  {group:<8} {size:>9} bytes")
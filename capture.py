@@ -0,0 +1,155 @@
+# capture.py
+from __future__ import annotations
+
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import zlib
+
+import pygame
+
+# Memory layouts pygame.image.frombuffer understands for 32-bit surfaces.
+_BUFFER_FORMATS = {"RGBA", "ARGB", "BGRA"}
+
+
+def _buffer_format(surf: pygame.Surface) -> str | None:
+    """
+    Byte order of a 32-bit surface's pixels in memory ("BGRA" for the usual XRGB8888
+    display), or None if its raw buffer can't be reinterpreted directly.
+    """
+    if sys.byteorder != "little" or surf.get_bytesize() != 4:
+        return None
+    if surf.get_pitch() != surf.get_width() * 4:
+        return None
+    order = ["A"] * 4
+    for channel, shift, mask in zip("RGB", surf.get_shifts(), surf.get_masks()):
+        if not mask:
+            return None
+        order[shift // 8] = channel
+    fmt = "".join(order)
+    return fmt if fmt in _BUFFER_FORMATS else None
+
+
+def _png(rgb: bytes, width: int, height: int, level: int) -> bytes:
+    """Minimal 8-bit RGB PNG; zlib does the heavy lifting (and drops the GIL)."""
+    stride = width * 3
+    rows = b"".join(b"\x00" + rgb[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data)))
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">2I5B", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows, level))
+            + chunk(b"IEND", b""))
+
+
+class FrameCapture:
+    """
+    Records the display to `out_dir` without stalling the game loop.
+
+    grab() only copies the display's pixel buffer (a memcpy) and queues it; colour
+    conversion and encoding happen on a background thread. fmt "png" writes a numbered
+    PNG sequence, "raw" appends rgb24 frames to one file with a JSON sidecar describing
+    how to feed it to ffmpeg. When the queue is full a live capture drops the frame
+    (counted in `dropped`); with drop=False (offline replays) it waits instead.
+    """
+    def __init__(self,
+                 out_dir: str,
+                 fmt: str = "png",
+                 fps: int = 60,
+                 max_queue: int = 8,
+                 drop: bool = True,
+                 png_level: int = 1) -> None:
+        if fmt not in ("png", "raw"):
+            raise ValueError(f"Unknown capture format: {fmt}")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.fps = fps
+        self.drop = drop
+        self.png_level = png_level
+
+        self.frames = 0
+        self.dropped = 0
+        self.size: tuple[int, int] | None = None
+        self._layout: str | None = None
+        self._raw_file = None
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self._thread.start()
+
+    def grab(self, surf: pygame.Surface) -> bool:
+        """Queues the current contents of `surf`. Returns False if the frame was dropped."""
+        if self.size is None:
+            self.size = surf.get_size()
+            self._layout = _buffer_format(surf) or "RGB"
+        elif surf.get_size() != self.size:
+            raise ValueError("Capture surface changed size mid-recording")
+
+        if self.drop and self._queue.full():
+            self.dropped += 1
+            return False
+
+        if self._layout == "RGB":
+            data = pygame.image.tobytes(surf, "RGB")
+        else:
+            data = surf.get_buffer().raw
+        self._queue.put((self.frames, data))
+        self.frames += 1
+        return True
+
+    def close(self) -> None:
+        """Flushes the queue, finishes the output and writes the sidecar."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._raw_file is not None:
+            self._raw_file.close()
+            self._raw_file = None
+
+        info = {
+            "format": self.fmt,
+            "fps": self.fps,
+            "frames": self.frames,
+            "dropped": self.dropped,
+        }
+        if self.size is not None:
+            w, h = self.size
+            info["size"] = [w, h]
+            if self.fmt == "raw":
+                info["ffmpeg"] = (f"ffmpeg -f rawvideo -pixel_format rgb24 -video_size {w}x{h} "
+                                  f"-framerate {self.fps} -i capture.rgb capture.mp4")
+            else:
+                info["ffmpeg"] = (f"ffmpeg -framerate {self.fps} -i frame_%06d.png "
+                                  f"-pix_fmt yuv420p capture.mp4")
+        with open(os.path.join(self.out_dir, "capture.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+
+    # ---------- encoder thread ----------
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            index, data = job
+            self._encode(index, data)
+
+    def _encode(self, index: int, data: bytes) -> None:
+        w, h = self.size
+        if self._layout != "RGB":
+            data = pygame.image.tobytes(pygame.image.frombuffer(data, self.size, self._layout),
+                                        "RGB")
+        if self.fmt == "raw":
+            if self._raw_file is None:
+                self._raw_file = open(os.path.join(self.out_dir, "capture.rgb"), "wb")
+            self._raw_file.write(data)
+        else:
+            path = os.path.join(self.out_dir, f"frame_{index:06d}.png")
+            with open(path, "wb") as f:
+                f.write(_png(data, w, h, self.png_level))
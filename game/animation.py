@@ -0,0 +1,106 @@
+# game/animation.py
+from __future__ import annotations
+
+import pygame
+
+from assets import load_image
+from memreport import register_owner
+
+# Baked frames keyed by (path, size, flip_x, flip_y, angle). Every transform happens
+# once here at load time; playback only indexes into lists of these surfaces.
+_FRAME_CACHE: dict[tuple, pygame.Surface] = {}
+_FRAME_MASKS: dict[tuple, pygame.mask.Mask] = {}
+
+
+def bake_frame(path: str,
+               size: tuple[int, int],
+               flip_x: bool = False,
+               flip_y: bool = False,
+               angle: int = 0) -> pygame.Surface:
+    key = (path, size, flip_x, flip_y, angle)
+    if key in _FRAME_CACHE:
+        return _FRAME_CACHE[key]
+
+    surf = load_image(path, scale_to=size)
+    if flip_x or flip_y:
+        surf = pygame.transform.flip(surf, flip_x, flip_y)
+    if angle % 360:
+        surf = pygame.transform.rotate(surf, angle)
+
+    _FRAME_CACHE[key] = surf
+    return surf
+
+
+def bake_mask(path: str,
+              size: tuple[int, int],
+              flip_x: bool = False,
+              flip_y: bool = False,
+              angle: int = 0) -> pygame.mask.Mask:
+    """Collision mask of the matching baked frame, built once."""
+    key = (path, size, flip_x, flip_y, angle)
+    mask = _FRAME_MASKS.get(key)
+    if mask is None:
+        mask = pygame.mask.from_surface(bake_frame(path, size, flip_x, flip_y, angle))
+        _FRAME_MASKS[key] = mask
+    return mask
+
+
+def evict_frames(path: str) -> int:
+    """Drops every baked variant of one image. Returns how many."""
+    keys = [k for k in _FRAME_CACHE if k[0] == path]
+    for k in keys:
+        del _FRAME_CACHE[k]
+        _FRAME_MASKS.pop(k, None)
+    return len(keys)
+
+
+register_owner("animation", lambda: list(_FRAME_CACHE.values()))
+
+
+class Animation:
+    """A looping list of pre-baked frames (and their collision masks)."""
+    def __init__(self, frames: list[pygame.Surface], fps: float,
+                 masks: list[pygame.mask.Mask] | None = None) -> None:
+        if not frames:
+            raise ValueError("Animation needs at least one frame")
+        self.frames = frames
+        self.masks = masks
+        self.fps = fps
+
+    def index_at(self, t: float) -> int:
+        return int(t * self.fps) % len(self.frames)
+
+    def frame_at(self, t: float) -> pygame.Surface:
+        return self.frames[self.index_at(t)]
+
+    def mask_at(self, t: float) -> pygame.mask.Mask | None:
+        if self.masks is None:
+            return None
+        return self.masks[self.index_at(t)]
+
+
+def bake_animation(paths: list[str],
+                   size: tuple[int, int],
+                   fps: float,
+                   flip_x: bool = False,
+                   flip_y: bool = False) -> Animation:
+    return Animation([bake_frame(p, size, flip_x, flip_y) for p in paths], fps,
+                     masks=[bake_mask(p, size, flip_x, flip_y) for p in paths])
+
+
+def bake_facings(path: str,
+                 size: tuple[int, int],
+                 horizontal: bool,
+                 vertical: bool) -> dict[tuple[bool, bool], pygame.Surface]:
+    """
+    Variants of a single sprite keyed by (reversed_x, reversed_y): the art is assumed to
+    face the object's starting direction, and reversing along an axis mirrors it.
+    """
+    variants = {(False, False): bake_frame(path, size)}
+    if horizontal:
+        variants[(True, False)] = bake_frame(path, size, flip_x=True)
+    if vertical:
+        variants[(False, True)] = bake_frame(path, size, flip_y=True)
+    if horizontal and vertical:
+        variants[(True, True)] = bake_frame(path, size, flip_x=True, flip_y=True)
+    return variants
@@ -0,0 +1,75 @@
+# game/broadphase.py
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Protocol
+
+import pygame
+
+# ----------------------------
+# Kind tags (bit flags, resolved once when objects are created)
+# ----------------------------
+TAG_PICKUP = 1       # item that gives air when collected
+TAG_HAZARD = 2       # item that costs air when stepped on
+TAG_CAR = 4          # traffic: hurts on contact, never collectible
+TAG_COLLECTIBLE = 8  # moving obstacle that can be picked up with SPACE
+
+TAG_ITEMS = TAG_PICKUP | TAG_HAZARD
+TAG_ANY = TAG_PICKUP | TAG_HAZARD | TAG_CAR | TAG_COLLECTIBLE
+
+
+class Tagged(Protocol):
+    rect: pygame.Rect
+    tag: int
+
+
+class SweepAndPrune:
+    """
+    Sorted-interval broadphase on the x axis.
+
+    Entries stay sorted by their left edge. Objects only move a few pixels per frame, so
+    the list is nearly sorted when update() re-sorts it and timsort does that in about
+    linear time. A query bisects to the candidates whose x-interval can overlap and only
+    those get a tag and rect test.
+    """
+    def __init__(self) -> None:
+        self._entries: list[Tagged] = []
+        self._lefts: list[int] = []
+        self._max_w = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, obj: Tagged) -> None:
+        self._entries.append(obj)
+
+    def remove(self, obj: Tagged) -> None:
+        # The sorted left edges are kept in step, so queries stay valid until update().
+        for i, e in enumerate(self._entries):
+            if e is obj:
+                del self._entries[i]
+                if i < len(self._lefts):
+                    del self._lefts[i]
+                return
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._lefts.clear()
+        self._max_w = 0
+
+    def update(self) -> None:
+        """Re-sorts after movement; call once before a batch of queries."""
+        entries = self._entries
+        entries.sort(key=lambda e: e.rect.left)
+        self._lefts = [e.rect.left for e in entries]
+        self._max_w = max((e.rect.w for e in entries), default=0)
+
+    def query(self, rect: pygame.Rect, mask: int = TAG_ANY) -> list[Tagged]:
+        """Entries with a tag in `mask` whose rect overlaps `rect`, in x order."""
+        entries = self._entries
+        hi = bisect_right(self._lefts, rect.right - 1)
+        lo = bisect_right(self._lefts, rect.left - self._max_w, 0, hi)
+        return [
+            e for e in entries[lo:hi]
+            if e.tag & mask and e.rect.colliderect(rect)
+        ]
@@ -0,0 +1,21 @@
+# game/camera.py
+from __future__ import annotations
+
+import pygame
+
+
+class Camera:
+    """
+    Viewport into a world that may be larger than the screen. For levels that fit the
+    screen the offset stays (0, 0) and everything draws exactly as before.
+    """
+    def __init__(self, view_size: tuple[int, int], world_size: tuple[int, int]) -> None:
+        self.view = pygame.Rect(0, 0, view_size[0], view_size[1])
+        self.world = pygame.Rect(0, 0, max(world_size[0], view_size[0]), max(world_size[1], view_size[1]))
+
+    def follow(self, target: pygame.Rect) -> None:
+        self.view.center = target.center
+        self.view.clamp_ip(self.world)
+
+    def to_screen(self, rect: pygame.Rect) -> tuple[int, int]:
+        return rect.x - self.view.x, rect.y - self.view.y
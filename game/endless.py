@@ -0,0 +1,95 @@
+# game/endless.py
+from __future__ import annotations
+
+import copy
+import random
+from itertools import count
+from typing import Iterator
+
+from settings import AIR_MAX, AIR_START
+
+# What a wave takes from a level template: the item rules. Map, walls and spawn zones
+# come from the endless base level instead.
+_ITEM_KEYS = ("item_spawn", "item_assets", "item_sizes", "air_rules", "item_lifetime", "max_items")
+# Everything a generated wave sets over the base level's config.
+WAVE_KEYS = (*_ITEM_KEYS, "flow_areas", "target_air", "wave", "template", "pattern")
+
+# Flow patterns: how many horizontal currents, and whether neighbours alternate direction.
+_PATTERNS = {
+    "still": (0, False),
+    "current": (1, False),
+    "bands": (3, False),
+    "shear": (3, True),
+}
+
+
+def wave_templates(levels: dict[int, dict]) -> list[tuple[int, dict]]:
+    """(level id, item rules) for every level; endless waves are variations of these."""
+    return [(level_id, {k: cfg[k] for k in _ITEM_KEYS if k in cfg})
+            for level_id, cfg in sorted(levels.items())]
+
+
+def _pick(templates: list[tuple[int, dict]], rng: random.Random) -> Iterator[dict]:
+    """Endless stream of template copies, never the same level twice in a row."""
+    last = None
+    for index in count():
+        level_id, rules = rng.choice([t for t in templates if t[0] != last] or templates)
+        last = level_id
+        wave = copy.deepcopy(rules)
+        wave["wave"] = index
+        wave["template"] = level_id
+        yield wave
+
+
+def _flows(waves: Iterator[dict], rng: random.Random, area: tuple[int, int, int, int],
+           speed: tuple[float, float]) -> Iterator[dict]:
+    """Gives every wave a random flow pattern of horizontal currents across `area`."""
+    x, y, w, h = area
+    for wave in waves:
+        pattern = rng.choice(list(_PATTERNS))
+        bands, alternate = _PATTERNS[pattern]
+        direction = rng.choice([-1, 1])
+        flows = []
+        for i in range(bands):
+            top = y + h * i // bands
+            bottom = y + h * (i + 1) // bands
+            v = direction * rng.uniform(*speed)
+            flows.append({"rect": [x, top, w, bottom - top], "vel": [round(v), 0],
+                          "on_exit": "remove"})
+            if alternate:
+                direction = -direction
+        wave["flow_areas"] = flows
+        wave["pattern"] = pattern
+        yield wave
+
+
+def _ramp(waves: Iterator[dict], plateau: int) -> Iterator[dict]:
+    """
+    Difficulty: more items, faster currents, more hazards and a higher air target per
+    wave, levelling off after `plateau` waves so a long session stays playable.
+    """
+    for wave in waves:
+        level = min(wave["wave"], plateau)
+        wave["max_items"] = wave.get("max_items", 5) + level // 3
+        for fa in wave["flow_areas"]:
+            fa["vel"] = [round(v * (1.0 + 0.05 * level)) for v in fa["vel"]]
+        step_on = wave.get("air_rules", {}).get("step_on", {})
+        weights = wave.setdefault("item_spawn", {}).setdefault("weights", {})
+        for kind in step_on:
+            weights[kind] = weights.get(kind, 1.0) * (1.0 + 0.1 * level)
+        wave["target_air"] = min(AIR_MAX, AIR_START + 20 + 2 * level)
+        yield wave
+
+
+def endless_waves(templates: list[tuple[int, dict]],
+                  seed: int,
+                  flow_area: tuple[int, int, int, int],
+                  flow_speed: tuple[float, float] = (35.0, 60.0),
+                  plateau: int = 12) -> Iterator[dict]:
+    """
+    The wave pipeline: pick a template, lay out currents, scale difficulty. Lazy all the
+    way down, so a wave only exists once someone asks for it, and a session of any
+    length holds just the waves that were pulled and not yet played.
+    """
+    rng = random.Random(seed)
+    return _ramp(_flows(_pick(templates, rng), rng, flow_area, flow_speed), plateau)
@@ -0,0 +1,52 @@
+# game/expiry.py
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class ExpiryQueue(Generic[T]):
+    """
+    Min-heap of objects keyed on their absolute expiry time.
+
+    pop_expired() only looks at the front of the heap, so a frame with nothing expiring
+    costs one comparison. Objects that leave early (picked up, flowed off screen) are
+    discarded lazily: their heap entry is blanked and skipped when it surfaces.
+    """
+    def __init__(self) -> None:
+        self._heap: list[list] = []
+        self._entries: dict[int, list] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, obj: T, expires_at: float | None) -> None:
+        """Schedules `obj`; None means it never expires and is not tracked at all."""
+        if expires_at is None:
+            return
+        entry = [expires_at, next(self._seq), obj]
+        self._entries[id(obj)] = entry
+        heapq.heappush(self._heap, entry)
+
+    def discard(self, obj: T) -> None:
+        entry = self._entries.pop(id(obj), None)
+        if entry is not None:
+            entry[2] = None
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._entries.clear()
+
+    def pop_expired(self, now: float) -> list[T]:
+        heap = self._heap
+        expired: list[T] = []
+        while heap and heap[0][0] <= now:
+            _, _, obj = heapq.heappop(heap)
+            if obj is not None:
+                del self._entries[id(obj)]
+                expired.append(obj)
+        return expired
@@ -4,6 +4,11 @@ from __future__ import annotations
 from settings import LEVEL_MAPS, LEVEL_TARGETS, SCREEN_W, SCREEN_H
 
 
+# Optional per-level keys:
+#   item_spawn["weights"]: {kind: weight} to bias spawns (default 1.0 each, 0 = never).
+#   item_lifetime: (min, max) seconds before an item despawns, or None for never.
+#   map_chunks: directory of a chunked map (see game/tilemap.py) for levels larger
+#       than the screen; world coordinates are then used as-is with a scrolling camera.
 LEVELS: dict[int, dict] = {
     # ========== LEVEL 1: FOREST ==========
     # Trash spawns in river (flows). Trees/bushes block movement.
@@ -19,6 +24,7 @@ LEVELS: dict[int, dict] = {
             "types": ["leaf", "can", "water_bottle", "electronics", "chemical"],
         },
         "max_items": 7,
+        "item_lifetime": (8.0, 15.0),
         "flow_areas": [
             {"rect": [314, 313, 646, 162], "vel": [50, 0], "on_exit": "remove"},
             {"rect": [0, 301, 245, 172], "vel": [50, 0], "on_exit": "remove"},
@@ -107,6 +113,7 @@ LEVELS: dict[int, dict] = {
             ],
         },
         "max_items": 7,
+        "item_lifetime": (8.0, 15.0),
         "spawn_interval": 1.5,
         "spawn_blocked_areas": [
             [64, 197, 226, 26],
@@ -165,12 +172,14 @@ LEVELS: dict[int, dict] = {
         },
         "moving_objects": [
             {
+                "kind": "car",
                 "image": "assets/cars.png",
                 "rect": (SCREEN_W // 2 - 70, 0, 50, 50),
                 "vel": (0, 180),
                 "bounds": (SCREEN_W // 2 - 70, 40, SCREEN_W // 2 - 20, SCREEN_H - 120),
             },
             {
+                "kind": "car",
                 "image": "assets/carsrl.png",
                 "rect": (SCREEN_H - 40, 0, 50, 50),
                 "vel": (190, 0),
@@ -214,6 +223,8 @@ LEVELS: dict[int, dict] = {
             "types": ["can", "electronics", "water_bottle", "trash", "oil_slick", "fishing_net"],
         },
         "max_items": 6,
+        # Ocean trash never times out; it only leaves by flowing off the edge.
+        "item_lifetime": None,
         "flow_areas": [
             {
                 "rect": [0, 72, 960, 467],
@@ -0,0 +1,174 @@
+# game/navigation.py
+from __future__ import annotations
+
+import math
+from collections import deque
+
+import pygame
+
+UNREACHABLE = math.inf
+
+# 8-connected neighbourhood; diagonals cost the same as straight steps (Chebyshev),
+# which keeps the field a plain BFS.
+_NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class NavGrid:
+    """
+    Walkable cells of a level for an agent of a fixed size, built once from the
+    collision rects. Cells are in agent-centre space: a cell is walkable if an agent
+    centred on it fits inside the world without touching any collision rect.
+    """
+    def __init__(self,
+                 world: pygame.Rect,
+                 collision_rects: list[pygame.Rect],
+                 agent_size: tuple[int, int],
+                 cell: int = 16) -> None:
+        self.cell = cell
+        self.cols = max(1, world.w // cell)
+        self.rows = max(1, world.h // cell)
+        self.origin = world.topleft
+
+        self.walkable = bytearray(self.cols * self.rows)
+        probe = pygame.Rect(0, 0, *agent_size)
+        for row in range(self.rows):
+            for col in range(self.cols):
+                probe.center = self.center(row * self.cols + col)
+                if world.contains(probe) and probe.collidelist(collision_rects) == -1:
+                    self.walkable[row * self.cols + col] = 1
+
+        # Neighbour lists of walkable cells. Diagonal moves must not cut a blocked corner.
+        self.links: list[tuple[int, ...]] = [() for _ in range(self.cols * self.rows)]
+        for i, ok in enumerate(self.walkable):
+            if not ok:
+                continue
+            col, row = i % self.cols, i // self.cols
+            out = []
+            for dx, dy in _NEIGHBOURS:
+                c, r = col + dx, row + dy
+                if not (0 <= c < self.cols and 0 <= r < self.rows):
+                    continue
+                if not self.walkable[r * self.cols + c]:
+                    continue
+                if dx and dy and not (self.walkable[row * self.cols + c]
+                                      and self.walkable[r * self.cols + col]):
+                    continue
+                out.append(r * self.cols + c)
+            self.links[i] = tuple(out)
+
+    def cell_at(self, pos: tuple[float, float]) -> int | None:
+        col = int((pos[0] - self.origin[0]) // self.cell)
+        row = int((pos[1] - self.origin[1]) // self.cell)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def center(self, i: int) -> tuple[int, int]:
+        col, row = i % self.cols, i // self.cols
+        return (self.origin[0] + col * self.cell + self.cell // 2,
+                self.origin[1] + row * self.cell + self.cell // 2)
+
+    def nearest_walkable(self, pos: tuple[float, float], radius: int = 3) -> int | None:
+        """The walkable cell closest to `pos` within `radius` cells (targets sitting on a wall)."""
+        i = self.cell_at(pos)
+        if i is None:
+            return None
+        if self.walkable[i]:
+            return i
+        col, row = i % self.cols, i // self.cols
+        best = None
+        best_d = math.inf
+        for r in range(max(0, row - radius), min(self.rows, row + radius + 1)):
+            for c in range(max(0, col - radius), min(self.cols, col + radius + 1)):
+                j = r * self.cols + c
+                d = (c - col) ** 2 + (r - row) ** 2
+                if self.walkable[j] and d < best_d:
+                    best, best_d = j, d
+        return best
+
+
+class FlowField:
+    """
+    Distance-to-nearest-target field over a NavGrid, plus the next cell to step to
+    from every cell. Steering is one array lookup per agent, however many agents.
+
+    Targets are keyed by any hashable owner (e.g. an item). Adding one relaxes the field
+    outward from its cell only as far as distances improve; removing or moving one marks
+    the field dirty and it is rebuilt once, on the next lookup.
+    """
+    def __init__(self, grid: NavGrid) -> None:
+        self.grid = grid
+        n = grid.cols * grid.rows
+        self.dist: list[float] = [UNREACHABLE] * n
+        self.next: list[int] = [-1] * n
+        self._targets: dict[object, int] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def set_target(self, key: object, pos: tuple[float, float]) -> None:
+        """Adds or moves a target. A no-op if it is still in the same cell."""
+        cell = self.grid.nearest_walkable(pos)
+        old = self._targets.get(key)
+        if old == cell:
+            return
+        if old is not None:
+            self._dirty = True
+        if cell is None:
+            self._targets.pop(key, None)
+            return
+        self._targets[key] = cell
+        if not self._dirty:
+            self._relax([cell])
+
+    def remove_target(self, key: object) -> None:
+        if self._targets.pop(key, None) is not None:
+            self._dirty = True
+
+    def clear(self) -> None:
+        self._targets.clear()
+        self._dirty = True
+
+    def step_toward(self, pos: tuple[float, float]) -> tuple[float, float]:
+        """Unit direction an agent centred at `pos` should move in; (0, 0) if none."""
+        if self._dirty:
+            self._rebuild()
+        grid = self.grid
+        i = grid.nearest_walkable(pos, radius=1)
+        if i is None or self.dist[i] == UNREACHABLE:
+            return 0.0, 0.0
+        # On a target cell: home in on the target's centre instead of stopping short.
+        goal = self.next[i] if self.next[i] >= 0 else i
+        gx, gy = grid.center(goal)
+        dx, dy = gx - pos[0], gy - pos[1]
+        length = math.hypot(dx, dy)
+        if length < 1.0:
+            return 0.0, 0.0
+        return dx / length, dy / length
+
+    def _rebuild(self) -> None:
+        n = len(self.dist)
+        self.dist = [UNREACHABLE] * n
+        self.next = [-1] * n
+        self._dirty = False
+        self._relax(list(set(self._targets.values())))
+
+    def _relax(self, sources: list[int]) -> None:
+        dist = self.dist
+        nxt = self.next
+        links = self.grid.links
+        queue: deque[int] = deque()
+        for s in sources:
+            if dist[s] > 0:
+                dist[s] = 0
+                nxt[s] = -1
+                queue.append(s)
+        while queue:
+            c = queue.popleft()
+            d = dist[c] + 1
+            for nb in links[c]:
+                if d < dist[nb]:
+                    dist[nb] = d
+                    nxt[nb] = c
+                    queue.append(nb)
@@ -0,0 +1,124 @@
+# game/particles.py
+from __future__ import annotations
+
+import random
+from array import array
+
+import pygame
+
+from memreport import register_owner
+
+# Effect styles: colour, dot radius, gravity (px/s^2), share of velocity kept per second.
+STYLES: dict[str, tuple[tuple[int, int, int], int, float, float]] = {
+    "pickup": ((120, 240, 200), 3, -40.0, 0.25),
+    "hazard": ((150, 60, 170), 4, 60.0, 0.35),
+    "car": ((235, 150, 60), 3, 220.0, 0.5),
+}
+
+# Particles fade out through this many pre-rendered alpha steps.
+FADE_STEPS = 4
+
+# Pre-rendered dots keyed by style name: one surface per fade step, brightest first.
+_SPRITES: dict[str, list[pygame.Surface]] = {}
+
+
+def _style_sprites(style: str) -> list[pygame.Surface]:
+    frames = _SPRITES.get(style)
+    if frames is None:
+        color, radius, _, _ = STYLES[style]
+        frames = []
+        for step in range(FADE_STEPS):
+            alpha = 255 * (FADE_STEPS - step) // FADE_STEPS
+            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*color, alpha), (radius, radius), radius)
+            frames.append(surf.convert_alpha())
+        _SPRITES[style] = frames
+    return frames
+
+
+register_owner("particles", lambda: [s for frames in _SPRITES.values() for s in frames])
+
+
+class ParticlePool:
+    """
+    Fixed-capacity particle system. State lives in flat typed arrays allocated once;
+    live particles are packed at the front and a dead one is replaced by the last live
+    one, so update and drawing only touch `count` entries. Emitting beyond the cap drops
+    the excess, which bounds both the update cost and the blit count per frame.
+    """
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0
+
+        self.x = array("f", bytes(4 * capacity))
+        self.y = array("f", bytes(4 * capacity))
+        self.vx = array("f", bytes(4 * capacity))
+        self.vy = array("f", bytes(4 * capacity))
+        self.age = array("f", bytes(4 * capacity))
+        self.life = array("f", bytes(4 * capacity))
+        self.style = array("B", bytes(capacity))
+
+        self._styles = list(STYLES)
+        self._frames = [_style_sprites(s) for s in self._styles]
+        self._physics = [(STYLES[s][2], STYLES[s][3]) for s in self._styles]
+        self._half = [STYLES[s][1] for s in self._styles]
+        # Visual only: keep gameplay randomness (and save states) untouched.
+        self._rng = random.Random(random.getrandbits(64))
+
+    def emit(self, pos: tuple[float, float], style: str, n: int,
+             speed: float = 120.0, life: float = 0.6) -> None:
+        s = self._styles.index(style)
+        rng = self._rng
+        for k in range(n):
+            i = self.count
+            if i >= self.capacity:
+                self.dropped += n - k
+                return
+            self.count += 1
+            vx = rng.uniform(-1.0, 1.0)
+            vy = rng.uniform(-1.0, 1.0)
+            v = speed * rng.uniform(0.4, 1.0)
+            self.x[i], self.y[i] = pos
+            self.vx[i] = vx * v
+            self.vy[i] = vy * v
+            self.age[i] = 0.0
+            self.life[i] = life * rng.uniform(0.7, 1.0)
+            self.style[i] = s
+
+    def update(self, dt: float) -> None:
+        x, y, vx, vy, age, life, style = (self.x, self.y, self.vx, self.vy,
+                                           self.age, self.life, self.style)
+        physics = self._physics
+        i = 0
+        while i < self.count:
+            age[i] += dt
+            if age[i] >= life[i]:
+                last = self.count - 1
+                x[i], y[i], vx[i], vy[i] = x[last], y[last], vx[last], vy[last]
+                age[i], life[i], style[i] = age[last], life[last], style[last]
+                self.count = last
+                continue
+            gravity, drag = physics[style[i]]
+            keep = 1.0 - (1.0 - drag) * dt
+            vx[i] *= keep
+            vy[i] = vy[i] * keep + gravity * dt
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            i += 1
+
+    def blit_list(self, view: pygame.Rect) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        """(sprite, screen position) pairs for one screen.blits() call."""
+        ox, oy = view.x, view.y
+        frames = self._frames
+        half = self._half
+        out = []
+        for i in range(self.count):
+            s = self.style[i]
+            step = int(self.age[i] / self.life[i] * FADE_STEPS)
+            out.append((frames[s][min(step, FADE_STEPS - 1)],
+                        (int(self.x[i]) - ox - half[s], int(self.y[i]) - oy - half[s])))
+        return out
+
+    def clear(self) -> None:
+        self.count = 0
@@ -0,0 +1,93 @@
+# game/spawn_table.py
+from __future__ import annotations
+
+import random
+from typing import Sequence
+
+from game.level_data import LEVELS
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table: O(n) to build, O(1) per sample for any weight distribution.
+    """
+    def __init__(self, weights: Sequence[float]) -> None:
+        n = len(weights)
+        if n == 0:
+            raise ValueError("AliasTable needs at least one weight")
+        total = float(sum(weights))
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError(f"Invalid spawn weights: {list(weights)}")
+
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # Whatever is left is 1.0 up to rounding error.
+        for i in small + large:
+            self.prob[i] = 1.0
+
+        self.n = n
+
+    def sample(self, rng: random.Random | None = None) -> int:
+        r = (rng or random).random() * self.n
+        i = int(r)
+        # Reuse the fractional part as the coin flip: one random() call per sample.
+        return i if r - i < self.prob[i] else self.alias[i]
+
+
+class SpawnTable:
+    """The item kinds a level can spawn, with their relative weights."""
+    def __init__(self, kinds: list[str], weights: list[float]) -> None:
+        self.kinds = kinds
+        self.weights = weights
+        self._alias = AliasTable(weights)
+
+    def sample(self, rng: random.Random | None = None) -> str:
+        return self.kinds[self._alias.sample(rng)]
+
+
+def compile_spawn_table(cfg: dict) -> SpawnTable | None:
+    """
+    Kinds come from item_spawn["types"] plus anything with an air rule, in that order.
+    item_spawn["weights"] can bias any kind (default 1.0, 0 disables it).
+    """
+    item_spawn = cfg.get("item_spawn", {})
+    air_rules = cfg.get("air_rules", {})
+
+    kinds = list(item_spawn.get("types", []))
+    for k in list(air_rules.get("pickup", {})) + list(air_rules.get("step_on", {})):
+        if k not in kinds:
+            kinds.append(k)
+
+    overrides = item_spawn.get("weights", {})
+    weights = [float(overrides.get(k, 1.0)) for k in kinds]
+
+    live = [(k, w) for k, w in zip(kinds, weights) if w > 0]
+    if not live:
+        return None
+    return SpawnTable([k for k, _ in live], [w for _, w in live])
+
+
+_TABLES: dict[int, SpawnTable | None] = {}
+
+
+def spawn_table_for(level_id: int) -> SpawnTable | None:
+    """Compiled once per level and shared by every LevelState for that level."""
+    if level_id not in _TABLES:
+        _TABLES[level_id] = compile_spawn_table(LEVELS[level_id])
+    return _TABLES[level_id]
+
+
+def invalidate_spawn_table(level_id: int) -> None:
+    """Forgets a level's compiled table (its level_data changed); recompiled on next use."""
+    _TABLES.pop(level_id, None)
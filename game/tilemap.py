@@ -0,0 +1,150 @@
+# game/tilemap.py
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pygame
+
+from assets import load_image, evict_image, open_asset
+
+# ----------------------------
+# Chunked map format
+# ----------------------------
+# A directory holding `map.json` and one PNG per chunk:
+#
+#   {"world": [w, h], "chunk": 256, "pattern": "chunk_{cx}_{cy}.png"}
+#
+# Chunks are square, `chunk` pixels wide (edge chunks may be smaller). Missing chunk
+# files are treated as empty. Cut a big PNG into this format with:
+#
+#   python -m game.tilemap <map.png> <out_dir> [chunk]
+
+MAP_MANIFEST = "map.json"
+DEFAULT_CHUNK = 256
+
+
+class SingleImageMap:
+    """The classic one-PNG, screen-sized map."""
+    def __init__(self, path: str, size: tuple[int, int]) -> None:
+        self.path = path
+        self.size = size
+        self.image = load_image(path, scale_to=size)
+
+    def draw(self, screen: pygame.Surface, view: pygame.Rect) -> None:
+        screen.blit(self.image, (-view.x, -view.y))
+
+    def reload(self, path: str) -> bool:
+        """Re-reads the map if it was loaded from `path` (hot reload)."""
+        if path != self.path:
+            return False
+        self.image = load_image(path, scale_to=self.size)
+        return True
+
+    def release(self) -> None:
+        self.image = None
+
+
+class ChunkedMap:
+    """
+    Large map streamed in fixed-size chunks. Chunks within `keep` chunks of the viewport
+    are decoded on demand and cached; chunks further away are evicted (also from the
+    asset cache), so memory tracks the view size, not the map size.
+    """
+    def __init__(self, directory: str, keep: int = 1) -> None:
+        src = open_asset(os.path.join(directory, MAP_MANIFEST))
+        with (open(src, "rb") if isinstance(src, str) else src) as f:
+            meta = json.load(f)
+
+        self.directory = directory
+        self.size = (int(meta["world"][0]), int(meta["world"][1]))
+        self.chunk = int(meta.get("chunk", DEFAULT_CHUNK))
+        self.pattern = meta.get("pattern", "chunk_{cx}_{cy}.png")
+        self.keep = keep
+
+        self.cols = (self.size[0] + self.chunk - 1) // self.chunk
+        self.rows = (self.size[1] + self.chunk - 1) // self.chunk
+        self._chunks: dict[tuple[int, int], pygame.Surface | None] = {}
+
+    def _path(self, cx: int, cy: int) -> str:
+        return os.path.join(self.directory, self.pattern.format(cx=cx, cy=cy))
+
+    def _chunk_range(self, view: pygame.Rect, pad: int) -> tuple[range, range]:
+        c = self.chunk
+        x0 = max(0, view.left // c - pad)
+        y0 = max(0, view.top // c - pad)
+        x1 = min(self.cols - 1, (view.right - 1) // c + pad)
+        y1 = min(self.rows - 1, (view.bottom - 1) // c + pad)
+        return range(x0, x1 + 1), range(y0, y1 + 1)
+
+    def _get(self, cx: int, cy: int) -> pygame.Surface | None:
+        key = (cx, cy)
+        if key not in self._chunks:
+            try:
+                self._chunks[key] = load_image(self._path(cx, cy), convert_alpha=False)
+            except FileNotFoundError:
+                self._chunks[key] = None
+        return self._chunks[key]
+
+    def stream(self, view: pygame.Rect) -> None:
+        """Loads chunks around the view and evicts the ones that drifted out of range."""
+        xs, ys = self._chunk_range(view, self.keep)
+        for key in [k for k in self._chunks if k[0] not in xs or k[1] not in ys]:
+            if self._chunks.pop(key) is not None:
+                evict_image(self._path(*key))
+        for cy in ys:
+            for cx in xs:
+                self._get(cx, cy)
+
+    def draw(self, screen: pygame.Surface, view: pygame.Rect) -> None:
+        self.stream(view)
+        xs, ys = self._chunk_range(view, 0)
+        c = self.chunk
+        blits = []
+        for cy in ys:
+            for cx in xs:
+                surf = self._chunks.get((cx, cy))
+                if surf is not None:
+                    blits.append((surf, (cx * c - view.x, cy * c - view.y)))
+        screen.blits(blits, doreturn=False)
+
+    def reload(self, path: str) -> bool:
+        """Forgets the chunk loaded from `path` (hot reload); the next draw streams it in again."""
+        for key in self._chunks:
+            if self._path(*key) == path:
+                del self._chunks[key]
+                return True
+        return False
+
+    def release(self) -> None:
+        for key, surf in self._chunks.items():
+            if surf is not None:
+                evict_image(self._path(*key))
+        self._chunks.clear()
+
+
+def cut_map(src: str, out_dir: str, chunk: int = DEFAULT_CHUNK) -> dict:
+    """Cuts a large PNG into chunk files plus a manifest."""
+    image = pygame.image.load(src)
+    w, h = image.get_size()
+    os.makedirs(out_dir, exist_ok=True)
+
+    pattern = "chunk_{cx}_{cy}.png"
+    for cy in range((h + chunk - 1) // chunk):
+        for cx in range((w + chunk - 1) // chunk):
+            area = pygame.Rect(cx * chunk, cy * chunk, chunk, chunk).clip(image.get_rect())
+            pygame.image.save(image.subsurface(area), os.path.join(out_dir, pattern.format(cx=cx, cy=cy)))
+
+    meta = {"world": [w, h], "chunk": chunk, "pattern": pattern}
+    with open(os.path.join(out_dir, MAP_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: python -m game.tilemap <map.png> <out_dir> [chunk]")
+        sys.exit(2)
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_CHUNK
+    print(cut_map(sys.argv[1], sys.argv[2], size))
@@ -0,0 +1,101 @@
+# hotreload.py
+from __future__ import annotations
+
+import importlib
+import os
+import time
+
+import game.level_data as level_data
+from assets import cached_image_paths, evict_image
+from game.animation import evict_frames
+from game.spawn_table import invalidate_spawn_table
+from states.level_state import LevelState
+
+
+class HotReloader:
+    """
+    Dev-mode watcher (--dev or HOT_RELOAD). Every `interval` seconds it stats
+    game/level_data.py and each image file the asset cache currently holds, and on a
+    change rebuilds only what was built from that file:
+
+      * an image: its cache entries (every size/format, masks, baked animation frames)
+        are evicted, and the live LevelState re-reads the map, objects, item kinds or
+        player frames that use it;
+      * level_data: the module is re-executed, LEVELS is updated in place for the levels
+        that changed, their compiled spawn tables are dropped, and the live LevelState
+        rebuilds the structures fed by the changed keys (see LevelState.reload_config).
+
+    Nothing restarts: the player, air and timers carry on. Polling stats a few dozen
+    files a couple of times a second, cheap enough to leave on while tuning.
+    """
+    def __init__(self, interval: float = 0.5) -> None:
+        self.interval = interval
+        self._next_poll = 0.0
+        self._data_path = level_data.__file__
+        self._data_mtime = _mtime(self._data_path)
+        self._mtimes: dict[str, float | None] = {}
+
+    def poll(self, state: object) -> None:
+        """Call once per frame, while nothing else is touching `state`."""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + self.interval
+
+        mtime = _mtime(self._data_path)
+        if mtime != self._data_mtime:
+            self._data_mtime = mtime
+            self._reload_level_data(state)
+
+        # Files are first seen when something loads them; only later edits count. Files
+        # that left the cache are forgotten, they will be read fresh anyway.
+        paths = cached_image_paths()
+        for path in [p for p in self._mtimes if p not in paths]:
+            del self._mtimes[path]
+        for path in paths:
+            mtime = _mtime(path)
+            if path not in self._mtimes:
+                self._mtimes[path] = mtime
+            elif mtime != self._mtimes[path]:
+                self._mtimes[path] = mtime
+                self._reload_image(path, state)
+
+    def _reload_image(self, path: str, state: object) -> None:
+        count = evict_image(path) + evict_frames(path)
+        if isinstance(state, LevelState):
+            state.reload_asset(path)
+        print(f"[reload] {path}: {count} cached variants rebuilt")
+
+    def _reload_level_data(self, state: object) -> None:
+        levels = level_data.LEVELS
+        before = dict(levels)
+        try:
+            importlib.reload(level_data)
+            fresh = level_data.LEVELS
+        except Exception as e:
+            print(f"[reload] {self._data_path} not reloaded: {e!r}")
+            return
+        finally:
+            # Everyone imported the original dict; keep that object and update it.
+            level_data.LEVELS = levels
+
+        levels.clear()
+        levels.update(fresh)
+        changed_levels = [i for i in levels if before.get(i) != levels[i]]
+        for level_id in changed_levels:
+            invalidate_spawn_table(level_id)
+        print(f"[reload] {self._data_path}: levels {changed_levels or 'unchanged'}")
+
+        if isinstance(state, LevelState) and state.level_id in changed_levels:
+            old = before.get(state.level_id, {})
+            new = levels[state.level_id]
+            keys = {k for k in old.keys() | new.keys() if old.get(k) != new.get(k)}
+            state.reload_config(keys)
+            print(f"[reload] level {state.level_id} rebuilt: {', '.join(sorted(keys))}")
+
+
+def _mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
@@ -1,46 +1,272 @@
 # main.py
 from __future__ import annotations
 
+import argparse
 import asyncio
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 
-from settings import SCREEN_W, SCREEN_H, FPS, CAPTION
+import audio
+import telemetry
+from alloctrace import AllocTracer
+from assets import mount_bundle
+from capture import FrameCapture
+from hotreload import HotReloader
+from memreport import format_report
+from pacing import FrameScheduler
+from settings import (
+    SCREEN_W, SCREEN_H, FPS, UPDATE_HZ, CAPTION,
+    IDLE_POLL_INTERVAL,
+    PIPELINED,
+    PACING_SPIN,
+    ASSET_BUNDLE,
+    MEMORY_REPORT, PACING_REPORT,
+    ALLOC_REPORT_PATH, ALLOC_SAMPLE_FRAMES,
+    HOT_RELOAD, HOT_RELOAD_INTERVAL,
+    TELEMETRY_ENABLED, TELEMETRY_PATH, TELEMETRY_BUFFER, TELEMETRY_BATCH,
+    TELEMETRY_FLUSH_INTERVAL, TELEMETRY_FRAME_WINDOW, SLOW_FRAME_MS, TELEMETRY_MAX_BYTES,
+    SAVE_PATH, SAVE_INTERVAL, RESUME_SAVE,
+    CAPTURE_QUEUE,
+)
+from savestate import SaveWriter, load as load_save
+from states.base_state import BaseState
+from states.level_state import LevelState
+from states.endless_state import EndlessState
 from states.title_state import TitleState
 
+# Window/app events after which the game may never get another frame.
+_SUSPEND_EVENTS = (
+    pygame.WINDOWHIDDEN,
+    pygame.WINDOWFOCUSLOST,
+    pygame.WINDOWMINIMIZED,
+    pygame.APP_WILLENTERBACKGROUND,
+)
 
-async def main() -> None:
-    pygame.init()
+# Input that counts as a user gesture (browsers only allow audio to start on one).
+_GESTURE_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.FINGERDOWN)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=CAPTION)
+    parser.add_argument("--capture", metavar="DIR",
+                        help="record every displayed frame into DIR")
+    parser.add_argument("--capture-format", choices=("png", "raw"), default="png",
+                        help="PNG sequence or one raw rgb24 file (default: png)")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window, fixed timestep, intros skipped, no save/resume (replays)")
+    parser.add_argument("--seed", type=int, help="seed all gameplay randomness")
+    parser.add_argument("--level", type=int, help="start directly in this level")
+    parser.add_argument("--endless", action="store_true", help="start directly in endless mode")
+    parser.add_argument("--autopilot", action="store_true",
+                        help="the bot plays every level (the input for headless replays)")
+    parser.add_argument("--frames", type=int, help="quit after this many frames")
+    parser.add_argument("--trace-alloc", action="store_true",
+                        help="trace allocations per frame and state (toggle in game with F9)")
+    parser.add_argument("--dev", action="store_true",
+                        help="hot-reload level data and images when they change on disk")
+    # Unknown arguments are left alone (the web runtime passes its own).
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+async def _wait_for_events(timeout: float) -> list[pygame.event.Event]:
+    """
+    Sleeps until an input event arrives or `timeout` seconds pass, whichever is first.
+    Used while the current state is idle so we don't redraw a static screen at full FPS.
+    """
+    if sys.platform == "emscripten":
+        # The browser needs control back; poll in small async sleeps instead of blocking.
+        deadline = time.monotonic() + timeout
+        while True:
+            events = pygame.event.get()
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0:
+                return events
+            await asyncio.sleep(min(IDLE_POLL_INTERVAL, remaining))
+
+    if math.isinf(timeout):
+        first = pygame.event.wait()
+    else:
+        first = pygame.event.wait(max(1, int(timeout * 1000)))
+    if first.type == pygame.NOEVENT:
+        return pygame.event.get()
+    return [first] + pygame.event.get()
+
+
+def _simulate(state: BaseState, events: list[pygame.event.Event], steps: list[float]) -> None:
+    for event in events:
+        state.handle_event(event)
+    for dt in steps:
+        if state.next_state() is not None:
+            break
+        state.update(dt)
+
+
+def _enter(state: BaseState, args: argparse.Namespace) -> BaseState:
+    """
+    Sets up a state as it becomes current. A headless run has no keyboard, so level
+    intros are skipped; with --autopilot the flow-field bot does the playing, which
+    makes a seeded headless run a repeatable replay of actual gameplay.
+    """
+    if isinstance(state, LevelState):
+        if args.headless:
+            state.level_intro_active = False
+        if args.autopilot:
+            state.set_autopilot(True)
+    return state
+
+
+def _transition(state: BaseState, args: argparse.Namespace) -> BaseState:
+    make = state.next_state()
+    if make is None:
+        return state
+    # Built here, on the main thread, after the old state let go of its surfaces.
+    state.teardown()
+    return _enter(make(), args)
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    # Not pygame.init(): the mixer is started by audio.py on first use.
+    pygame.display.init()
+    pygame.font.init()
     pygame.display.set_caption(CAPTION)
     screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
-    clock = pygame.time.Clock()
+    scheduler = FrameScheduler(FPS, UPDATE_HZ, spin=PACING_SPIN)
     print(SCREEN_W, SCREEN_H)
+    if TELEMETRY_ENABLED and not args.headless:
+        telemetry.start(TELEMETRY_PATH, capacity=TELEMETRY_BUFFER, batch=TELEMETRY_BATCH,
+                        flush_interval=TELEMETRY_FLUSH_INTERVAL,
+                        frame_window=TELEMETRY_FRAME_WINDOW, slow_frame_ms=SLOW_FRAME_MS,
+                        max_bytes=TELEMETRY_MAX_BYTES)
+    # Dev mode reads loose files (a bundle would shadow the edits) and watches them.
+    reloader = None
+    if (args.dev or HOT_RELOAD) and sys.platform != "emscripten":
+        reloader = HotReloader(HOT_RELOAD_INTERVAL)
+    else:
+        mount_bundle(ASSET_BUNDLE)
+
+    worker = None
+    if PIPELINED and sys.platform != "emscripten":
+        worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sim")
+
+    capture = None
+    if args.capture:
+        # Offline renders must not lose frames; a live session must not stall on them.
+        capture = FrameCapture(args.capture, args.capture_format, fps=FPS,
+                               max_queue=CAPTURE_QUEUE, drop=not args.headless)
 
-    state = TitleState()
-    running = True
+    # Headless runs are replays: every frame advances exactly 1/FPS, nothing waits on
+    # input, and the player's real save is neither loaded nor overwritten.
+    fixed_dt = 1.0 / FPS if args.headless else None
+    saver = None if args.headless else SaveWriter(SAVE_PATH, SAVE_INTERVAL)
 
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                break
-            state.handle_event(event)
+    state: BaseState | None = None
+    if args.endless:
+        state = EndlessState()
+    elif args.level is not None:
+        state = LevelState(args.level)
+    elif saver is not None and RESUME_SAVE:
+        state = load_save(SAVE_PATH)
+    if state is None:
+        state = TitleState()
+    state = _enter(state, args)
 
-        if not running:
+    tracer = AllocTracer(ALLOC_REPORT_PATH, ALLOC_SAMPLE_FRAMES)
+    if args.trace_alloc:
+        tracer.start()
+
+    frame = 0
+    while args.frames is None or frame < args.frames:
+        frame += 1
+        # Recordings need a constant frame rate, so idle screens keep redrawing then.
+        idle_timeout = state.idle_timeout() if capture is None and fixed_dt is None else None
+        if idle_timeout is not None:
+            events = await _wait_for_events(idle_timeout)
+            scheduler.resync()
+
+        if fixed_dt is None:
+            dt = await scheduler.wait()
+        else:
+            dt = fixed_dt
+            await asyncio.sleep(0)
+        if idle_timeout is None:
+            events = pygame.event.get()
+
+        if any(event.type == pygame.QUIT for event in events):
+            if saver is not None:
+                saver.maybe_save(state, time.monotonic(), force=True)
             break
+        suspend = any(event.type in _SUSPEND_EVENTS for event in events)
+        if any(event.type in _GESTURE_EVENTS for event in events):
+            audio.unlock()
+        if any(event.type == pygame.KEYDOWN and event.key == pygame.K_F9 for event in events):
+            tracer.toggle()
 
-        dt = clock.tick(FPS) / 1000.0
+        # A frame after an idle wait is a single fixed-size update: the wait itself was
+        # idle time, not simulation time (cars must not jump, items must not expire).
+        steps = scheduler.steps(dt) if idle_timeout is None else [scheduler.step or scheduler.period]
+        if idle_timeout is None:
+            telemetry.frame(dt, type(state).__name__)
+        if reloader is not None:
+            reloader.poll(state)
+        tracer.begin_frame(state)
+        prev = state
+        snapshot = state.export_snapshot() if worker is not None else None
+        if snapshot is None:
+            _simulate(state, events, steps)
+            state.after_update()
+            state = _transition(state, args)
+            state.draw(screen)
+        else:
+            # Frame N is drawn from its snapshot while frame N+1 is simulated.
+            job = worker.submit(_simulate, state, events, steps)
+            state.draw_snapshot(screen, snapshot)
+            job.result()
+            state.after_update()
+            state = _transition(state, args)
 
-        state.update(dt)
+        tracer.end_frame()
 
-        nxt = state.next_state()
-        if nxt is not None:
-            state = nxt
+        if state is not prev:
+            del prev, snapshot
+            if saver is not None:
+                if isinstance(state, LevelState):
+                    saver.maybe_save(state, time.monotonic(), force=True)
+                else:
+                    saver.clear()
+            if MEMORY_REPORT:
+                print(format_report(state))
+        elif saver is not None:
+            saver.maybe_save(state, time.monotonic(), force=suspend)
 
-        state.draw(screen)
+        if capture is not None:
+            capture.grab(screen)
         pygame.display.flip()
+        telemetry.flush(force=suspend)
 
-        await asyncio.sleep(0)
-
+    tracer.stop()
+    telemetry.stop()
+    if worker is not None:
+        worker.shutdown()
+    if saver is not None:
+        saver.wait()
+    if capture is not None:
+        capture.close()
+        print(f"Captured {capture.frames} frames ({capture.dropped} dropped) to {args.capture}")
+    if PACING_REPORT:
+        print(scheduler.report())
     pygame.quit()
 
 
@@ -0,0 +1,103 @@
+# memreport.py
+from __future__ import annotations
+
+import gc
+from typing import Callable, Iterable
+
+import pygame
+
+from assets import cached_images, image_stats
+
+# Extra owners (fog tables, sprite caches...) register a provider that yields the
+# surfaces they keep resident. The asset cache and the live state are always reported.
+_OWNERS: dict[str, Callable[[], Iterable[pygame.Surface]]] = {}
+
+
+def register_owner(name: str, provider: Callable[[], Iterable[pygame.Surface]]) -> None:
+    _OWNERS[name] = provider
+
+
+def surface_bytes(surf: pygame.Surface) -> int:
+    return surf.get_pitch() * surf.get_height()
+
+
+def _state_surfaces(obj: object, depth: int = 3, seen: set[int] | None = None):
+    """Yields surfaces reachable from a state's attributes (and its game objects)."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or depth < 0:
+        return
+    seen.add(id(obj))
+
+    if isinstance(obj, pygame.Surface):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _state_surfaces(v, depth - 1, seen)
+    elif isinstance(obj, (list, tuple, set)):
+        for v in obj:
+            yield from _state_surfaces(v, depth - 1, seen)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        for v in vars(obj).values():
+            yield from _state_surfaces(v, depth - 1, seen)
+
+
+def collect(state: object) -> list[tuple[str, int, int]]:
+    """
+    Returns (owner, surface count, bytes) rows. Every pixel buffer is counted once,
+    under the first owner that holds it: asset cache, then registered owners, then the
+    state. Subsurfaces are charged to the buffer they share.
+    """
+    counted: set[int] = set()
+    rows: list[tuple[str, int, int]] = []
+
+    sources: list[tuple[str, Iterable[pygame.Surface]]] = [("asset cache", cached_images())]
+    sources += [(name, provider()) for name, provider in _OWNERS.items()]
+    sources.append(("state", _state_surfaces(state)))
+
+    for owner, surfaces in sources:
+        count = 0
+        total = 0
+        for surf in surfaces:
+            buf = surf.get_abs_parent()
+            if id(buf) in counted:
+                continue
+            counted.add(id(buf))
+            count += 1
+            total += surface_bytes(buf)
+        rows.append((owner, count, total))
+    return rows
+
+
+def live_states() -> dict[str, int]:
+    """Counts state objects still reachable after a full collection (leak check)."""
+    from states.base_state import BaseState
+
+    gc.collect()
+    counts: dict[str, int] = {}
+    for obj in gc.get_objects():
+        if isinstance(obj, BaseState):
+            name = type(obj).__name__
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def format_report(state: object) -> str:
+    label = type(state).__name__
+    if hasattr(state, "level_id"):
+        label += f"({state.level_id})"
+
+    lines = [f"[mem] now in {label}"]
+    grand = 0
+    for owner, count, total in collect(state):
+        lines.append(f"  {owner:<12} {count:>4} surfaces {total / 1024:>10.1f} KiB")
+        grand += total
+    lines.append(f"  {'total':<12} {'':>13} {grand / 1024:>10.1f} KiB")
+
+    formats = ", ".join(f"{fmt} x{count} ({total / 1024:.1f} KiB)"
+                        for fmt, (count, total) in sorted(image_stats().items()))
+    lines.append(f"  image formats: {formats or 'none'}")
+
+    live = ", ".join(f"{n} x{c}" for n, c in sorted(live_states().items()))
+    lines.append(f"  live states: {live or 'none'}")
+    return "\n".join(lines)
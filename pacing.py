@@ -0,0 +1,109 @@
+# pacing.py
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from collections import deque
+
+
+class FrameScheduler:
+    """
+    Paces the main loop against absolute deadlines instead of clock.tick().
+
+    Frame k is due at start + k * period, so an early or late frame doesn't shift every
+    frame after it. wait() sleeps asynchronously (handing the time back to the event
+    loop / browser) until `spin` seconds before the deadline and, on desktop, busy-waits
+    the rest; sleep() alone overshoots by a millisecond or more. Frames that start more
+    than a whole period late are counted as missed and the schedule resynchronises
+    instead of trying to catch up in a burst.
+
+    With update_hz set, steps(dt) turns real elapsed time into a whole number of fixed
+    simulation steps (an accumulator), so updates run at their own rate whatever the
+    render rate is.
+    """
+    def __init__(self,
+                 fps: float,
+                 update_hz: float | None = None,
+                 spin: float = 0.002,
+                 max_steps: int = 5,
+                 history: int = 600) -> None:
+        self.period = 1.0 / fps
+        self.step = 1.0 / update_hz if update_hz else None
+        self.max_steps = max_steps
+        # Browsers only resume us on their own schedule; spinning there just burns CPU.
+        self.spin = 0.0 if sys.platform == "emscripten" else spin
+
+        self._deadline: float | None = None
+        self._last: float | None = None
+        self._accum = 0.0
+
+        self.frames = 0
+        self.missed = 0
+        self.dropped_steps = 0
+        self._lateness: deque[float] = deque(maxlen=history)
+
+    async def wait(self) -> float:
+        """Waits for the next frame deadline; returns the real time since the last frame."""
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = now
+            self._last = now
+
+        remaining = self._deadline - now - self.spin
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        else:
+            await asyncio.sleep(0)
+        if sys.platform != "emscripten":
+            while time.perf_counter() < self._deadline:
+                pass
+
+        now = time.perf_counter()
+        late = now - self._deadline
+        self._lateness.append(late)
+        self.frames += 1
+        if late > self.period:
+            self.missed += int(late / self.period)
+            self._deadline = now
+        self._deadline += self.period
+
+        dt = now - self._last
+        self._last = now
+        return dt
+
+    def resync(self) -> None:
+        """
+        Restarts the schedule from now, e.g. after blocking on input while idle, so the
+        wait is neither reported as missed frames nor handed to the next update as dt.
+        """
+        if self._last is None:
+            return
+        self._deadline = self._last = time.perf_counter()
+        self._accum = 0.0
+
+    def steps(self, dt: float) -> list[float]:
+        """Fixed-size simulation steps owed for `dt` of real time (just [dt] if unset)."""
+        if self.step is None:
+            return [dt]
+        self._accum += dt
+        n = int(self._accum / self.step)
+        if n > self.max_steps:
+            # Far behind (a stall, a backgrounded tab): drop the backlog, don't spiral.
+            self.dropped_steps += n - self.max_steps
+            n = self.max_steps
+            self._accum = 0.0
+        else:
+            self._accum -= n * self.step
+        return [self.step] * n
+
+    def report(self) -> str:
+        late = sorted(self._lateness)
+        if not late:
+            return "[pacing] no frames"
+        p50 = late[len(late) // 2]
+        p99 = late[min(len(late) - 1, int(len(late) * 0.99))]
+        return (f"[pacing] {self.frames} frames at {1.0 / self.period:.0f} fps target, "
+                f"{self.missed} missed, {self.dropped_steps} update steps dropped; "
+                f"lateness p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, "
+                f"max {late[-1] * 1000:.2f} ms (last {len(late)} frames)")
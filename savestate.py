@@ -0,0 +1,183 @@
+# savestate.py
+from __future__ import annotations
+
+import math
+import os
+import struct
+import sys
+import threading
+
+import pygame
+
+from states.level_state import LevelState, Item
+
+# ----------------------------
+# Binary layout (little endian)
+# ----------------------------
+# header   : magic, version, level id, intro flag, air, t, spawn timer, car cooldown,
+#            player x/y, player facing
+# rng      : Mersenne Twister version, 625 state words, gauss flag + value
+# items    : count, then one _ITEM record each (kind is an index into the level's
+#            sorted spawn kinds, lifetime NaN = never expires, flow -1 = not moving)
+# obstacles: count, then one _OBSTACLE record per obstacle still in play
+
+MAGIC = b"RRS1"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHBiddd2iB")
+_RNG = struct.Struct("<B625IBd")
+_COUNT = struct.Struct("<H")
+_ITEM = struct.Struct("<H2i2f2db")
+_OBSTACLE = struct.Struct("<H2i2f")
+
+
+def encode(state: LevelState) -> bytes:
+    kinds = sorted(state._kind_info)
+    kind_index = {k: i for i, k in enumerate(kinds)}
+    flow_index = {id(fa["rect"]): i for i, fa in enumerate(state.flow_areas)}
+
+    rng_version, words, gauss = state.rng.getstate()
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, state.level_id, state.level_intro_active,
+                     int(state.air), state.t, state.spawn_timer, state._car_hit_cooldown,
+                     state.player.rect.x, state.player.rect.y, state.player.facing_left),
+        _RNG.pack(rng_version, *words, gauss is not None, gauss or 0.0),
+        _COUNT.pack(len(state.items)),
+    ]
+    for it in state.items:
+        flow = flow_index.get(id(it.bounds), -1) if it.moving else -1
+        parts.append(_ITEM.pack(kind_index[it.kind], it.rect.x, it.rect.y, it.vx, it.vy,
+                                it.spawn_time, math.nan if it.lifetime is None else it.lifetime,
+                                flow))
+    parts.append(_COUNT.pack(len(state.moving_obstacles)))
+    for mo in state.moving_obstacles:
+        parts.append(_OBSTACLE.pack(mo.index, mo.rect.x, mo.rect.y, mo.vx, mo.vy))
+    return b"".join(parts)
+
+
+def decode(data: bytes) -> LevelState:
+    """
+    Rebuilds a LevelState straight from a snapshot. The constructor only loads the
+    level's (cached) assets; items and obstacles are placed from the saved arrays and
+    the spawn logic never runs.
+    """
+    (magic, version, level_id, intro, air, t, spawn_timer, cooldown,
+     px, py, facing_left) = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a compatible save state")
+    pos = _HEADER.size
+
+    state = LevelState(level_id, populate=False)
+    state.level_intro_active = bool(intro)
+    state.air = air
+    state.t = t
+    state.spawn_timer = spawn_timer
+    state._car_hit_cooldown = cooldown
+    state.player.rect.topleft = (px, py)
+    state.player.facing_left = bool(facing_left)
+    state.camera.follow(state.player.rect)
+
+    rng = _RNG.unpack_from(data, pos)
+    pos += _RNG.size
+    state.rng.setstate((rng[0], tuple(rng[1:626]), rng[627] if rng[626] else None))
+
+    kinds = sorted(state._kind_info)
+    (count,) = _COUNT.unpack_from(data, pos)
+    pos += _COUNT.size
+    for _ in range(count):
+        kind_i, x, y, vx, vy, spawn_time, lifetime, flow = _ITEM.unpack_from(data, pos)
+        pos += _ITEM.size
+        kind = kinds[kind_i]
+        (w, h), img, mask, tag = state._kind_info[kind]
+        area = state.flow_areas[flow] if flow >= 0 else None
+        state._add_item(Item(kind, pygame.Rect(x, y, w, h), img, spawn_time,
+                             None if math.isnan(lifetime) else lifetime,
+                             moving=area is not None, vx=vx, vy=vy,
+                             bounds=area["rect"] if area else None,
+                             on_exit=area["on_exit"] if area else "bounce",
+                             tag=tag, mask=mask))
+
+    by_index = {mo.index: mo for mo in state.moving_obstacles}
+    (count,) = _COUNT.unpack_from(data, pos)
+    pos += _COUNT.size
+    kept = []
+    for _ in range(count):
+        index, x, y, vx, vy = _OBSTACLE.unpack_from(data, pos)
+        pos += _OBSTACLE.size
+        mo = by_index.pop(index, None)
+        if mo is not None:
+            mo.rect.topleft = (x, y)
+            mo.vx, mo.vy = vx, vy
+            mo.face()
+            kept.append(mo)
+    for mo in by_index.values():  # collected before the save
+        state._broadphase.remove(mo)
+    state.moving_obstacles = kept
+    return state
+
+
+def load(path: str) -> LevelState | None:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return decode(f.read())
+    except (OSError, ValueError, struct.error, KeyError, IndexError) as e:
+        print(f"Ignoring unreadable save state {path}: {e}")
+        return None
+
+
+class SaveWriter:
+    """
+    Periodic, hitch-free save writer. Encoding a snapshot is a few struct packs on the
+    main thread; the file write (to a temp file, then an atomic rename) happens on a
+    background thread. Unchanged snapshots are not rewritten.
+    """
+    def __init__(self, path: str, interval: float) -> None:
+        self.path = path
+        self.interval = interval
+        self._last_write = -math.inf
+        self._last_data: bytes | None = None
+        self._thread: threading.Thread | None = None
+
+    def maybe_save(self, state: object, now: float, force: bool = False) -> None:
+        if not isinstance(state, LevelState) or not state.SAVEABLE:
+            return
+        if not force and now - self._last_write < self.interval:
+            return
+        self._last_write = now
+
+        data = encode(state)
+        if data == self._last_data:
+            return
+        self._last_data = data
+        self._write(data)
+
+    def clear(self) -> None:
+        """Forget the save (e.g. the run finished)."""
+        self.wait()
+        self._last_data = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _write(self, data: bytes) -> None:
+        if sys.platform == "emscripten":
+            # No threads in the browser; the virtual FS write is a memory copy anyway.
+            self._write_file(data)
+            return
+        self.wait()
+        self._thread = threading.Thread(target=self._write_file, args=(data,), daemon=True)
+        self._thread.start()
+
+    def _write_file(self, data: bytes) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
@@ -7,8 +7,22 @@ from __future__ import annotations
 SCREEN_W = 960
 SCREEN_H = 540
 FPS = 60
+# Simulation steps per second, independent of FPS; None runs one update per frame.
+UPDATE_HZ = None
 CAPTION = "Retro Revival: Eco Quest"
 
+# Idle states (title, end, level intro) sleep instead of redrawing every frame.
+# In the browser we cannot block, so we poll for input at this interval (seconds).
+IDLE_POLL_INTERVAL = 0.05
+
+# Desktop only: simulate the next frame on a worker thread while the main thread draws
+# the current one from a snapshot. Ignored in the browser (no threads there).
+PIPELINED = False
+
+# The frame scheduler sleeps until this long (seconds) before each frame deadline and
+# busy-waits the rest on desktop, where sleep() alone overshoots.
+PACING_SPIN = 0.002
+
 # ----------------------------
 # Paths
 # ----------------------------
@@ -16,12 +30,37 @@ ASSETS_DIR = "assets"
 MAPS_DIR = f"{ASSETS_DIR}/maps"
 SPRITES_DIR = f"{ASSETS_DIR}/sprites"
 FONTS_DIR = f"{ASSETS_DIR}/fonts"
+SOUNDS_DIR = f"{ASSETS_DIR}/sounds"
+
+# Packed asset bundle (build with `python bundle.py`). If present it is used instead
+# of reading assets/ directly; without it the local files are the backing store. The
+# web build (.github/workflows/pages.yml) ships only the bundle, not assets/.
+ASSET_BUNDLE = "assets.rrb"
+
+# Sprite surface formats. "auto" lets assets.load_image analyze each sprite once and
+# use colorkey+RLE (or an 8-bit palette for big, low-color art) when its alpha is
+# effectively on/off; "alpha" keeps per-pixel alpha for everything.
+SPRITE_FORMAT = "auto"
+# Max share of visible pixels that may be semi-transparent for alpha to count as binary.
+SPRITE_BINARY_ALPHA = 0.08
+# Palettize only sprites in this size range (pixels): small ones blit faster as
+# colorkey, huge ones are too slow to analyze at load time.
+PALETTE_MIN_PIXELS = 128 * 128
+PALETTE_MAX_PIXELS = 512 * 512
 
 # ----------------------------
 # Player
 # ----------------------------
 PLAYER_SPEED = 220  # pixels per second
 PLAYER_SIZE = (32, 32)
+PLAYER_ANIM_FPS = 8  # walk cycle frames per second
+
+# ----------------------------
+# Navigation (bots / NPC collectors)
+# ----------------------------
+NAV_CELL = 16  # grid cell size in pixels
+# Moving targets (items in flow areas) are re-checked for a cell change this often.
+NAV_RETARGET_INTERVAL = 0.25
 
 # ----------------------------
 # Air quality / fog
@@ -33,6 +72,26 @@ AIR_START = 50
 # Fog alpha ranges from 0 (no fog) to ~180 (heavy fog)
 FOG_MIN_ALPHA = 0
 FOG_MAX_ALPHA = 180
+# Fog is quantized into this many alpha bands (precomputed once, picked by lookup).
+FOG_LEVELS = 16
+
+# ----------------------------
+# Effects
+# ----------------------------
+# Hard cap on live particles (pickup / hazard / car-hit bursts); extra ones are dropped.
+PARTICLE_CAP = 256
+# Item glow pulses through this many pre-rendered brightness steps.
+GLOW_STEPS = 8
+
+# ----------------------------
+# Audio
+# ----------------------------
+# The mixer starts on the first user input (required in the browser) or first sound.
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER = 512
+AUDIO_CHANNELS = 8  # fixed voice pool; the oldest sound is cut off when all are busy
+SFX_VOLUME = 0.8
+AMBIENCE_VOLUME = 0.4
 
 # ----------------------------
 # UI
@@ -48,6 +107,56 @@ UI_PADDING = 12
 # Pickup is SPACE.
 KEY_PICKUP = "SPACE"
 
+# ----------------------------
+# Save states
+# ----------------------------
+# Level progress is snapshotted to SAVE_PATH every SAVE_INTERVAL seconds and whenever
+# the window is hidden, so a reloaded tab or power-cycled kiosk resumes mid-level.
+SAVE_PATH = "savegame.rrs"
+SAVE_INTERVAL = 5.0
+RESUME_SAVE = True
+
+# ----------------------------
+# Capture (--capture DIR)
+# ----------------------------
+# Frames waiting for the encoder thread; a live capture drops frames beyond this.
+CAPTURE_QUEUE = 8
+
+# ----------------------------
+# Telemetry
+# ----------------------------
+# Session events (levels, pickups, hits, air, frame-time percentiles, asset loads)
+# appended to a local NDJSON file in batches. Off by default; headless replays never
+# record. The file is written to the working directory (the game folder when launched
+# normally) and rotated to TELEMETRY_PATH + ".1" at TELEMETRY_MAX_BYTES.
+TELEMETRY_ENABLED = False
+TELEMETRY_PATH = "telemetry.ndjson"
+TELEMETRY_MAX_BYTES = 4 * 1024 * 1024
+TELEMETRY_BUFFER = 4096          # ring buffer size (events); oldest dropped on overflow
+TELEMETRY_BATCH = 256            # flush once this many events are waiting...
+TELEMETRY_FLUSH_INTERVAL = 10.0  # ...or this many seconds have passed
+TELEMETRY_FRAME_WINDOW = 10.0    # seconds of frame times per percentile summary
+TELEMETRY_AIR_INTERVAL = 5.0     # seconds between air samples in a level
+SLOW_FRAME_MS = 50.0             # frames at least this long are logged individually
+
+# ----------------------------
+# Diagnostics
+# ----------------------------
+# Print resident surfaces by owner (asset cache, fog, state...) and the live state
+# objects after every state transition.
+MEMORY_REPORT = False
+# Print frame pacing stats (lateness percentiles, missed frames) on exit.
+PACING_REPORT = False
+# Allocation tracing (F9 or --trace-alloc): report file name (each session writes its
+# own copy with a timestamp suffix, plus a .csv of per-frame rows next to it) and how
+# often allocations are attributed to source lines.
+ALLOC_REPORT_PATH = "alloc_report.txt"
+ALLOC_SAMPLE_FRAMES = 120
+# Watch game/level_data.py and loaded images, and rebuild what changed in place (also
+# --dev). Loose files are read instead of the asset bundle while this is on.
+HOT_RELOAD = False
+HOT_RELOAD_INTERVAL = 0.5  # seconds between file checks
+
 # ----------------------------
 # Level progression (targets)
 # ----------------------------
@@ -61,6 +170,17 @@ LEVEL_TARGETS = {
     3: 100,
 }
 
+# ----------------------------
+# Endless mode (E on the title screen)
+# ----------------------------
+# Waves of items (kinds and rules from the levels above) with random currents, on the
+# map and walls of one screen-sized base level. Only ENDLESS_LOOKAHEAD upcoming waves
+# are generated and loaded ahead; images no upcoming wave needs are evicted.
+ENDLESS_BASE_LEVEL = 3
+ENDLESS_FLOW_AREA = (0, 72, SCREEN_W, SCREEN_H - 72)  # where currents may run (below the ocean's top bar)
+ENDLESS_LOOKAHEAD = 1
+ENDLESS_PLATEAU = 12  # difficulty stops rising after this many waves
+
 # ----------------------------
 # Asset filenames (initial framework)
 # ----------------------------
@@ -89,5 +209,21 @@ ITEM_SPRITES = {
     "chemical": f"{SPRITES_DIR}/trash_chemical.png",
 }
 
+# Sound effects (decoded once, kept in memory) and per-level ambience (streamed).
+# Missing files are simply silent.
+SOUND_FILES = {
+    "pickup": f"{SOUNDS_DIR}/pickup.ogg",
+    "hazard": f"{SOUNDS_DIR}/hazard.ogg",
+    "car_hit": f"{SOUNDS_DIR}/car_hit.ogg",
+    "level_up": f"{SOUNDS_DIR}/level_up.ogg",
+}
+
+LEVEL_AMBIENCE = {
+    1: f"{SOUNDS_DIR}/forest_ambience.ogg",
+    2: f"{SOUNDS_DIR}/city_ambience.ogg",
+    3: f"{SOUNDS_DIR}/ocean_ambience.ogg",
+}
+
 # You can change the player character image by editing PLAYER_SPRITES above,
-# and you can change world object images by editing the "image" fields in game/level_data.py.
\ No newline at end of file
+# and you can change world object images by editing the "image" fields in game/level_data.py.
+
@@ -1,8 +1,15 @@
 # states/base_state.py
 from __future__ import annotations
 
+from typing import Callable
+
 import pygame
 
+# Builds the state that comes next. States hand main() one of these instead of the
+# state itself, so loading the next screen happens on the main thread between frames,
+# never on the pipelined simulation thread while a snapshot is being drawn.
+StateFactory = Callable[[], "BaseState"]
+
 
 class BaseState:
 
@@ -12,8 +19,41 @@ class BaseState:
     def update(self, dt: float) -> None:
         pass
 
+    def after_update(self) -> None:
+        """
+        Called by main() on the main thread once a frame's updates are done. update()
+        may run on the pipelined simulation thread, so asset loading and eviction that
+        a state does while it plays belong here.
+        """
+        pass
+
     def draw(self, screen: pygame.Surface) -> None:
         pass
 
-    def next_state(self) -> "BaseState | None":
+    def export_snapshot(self) -> object | None:
+        """
+        Immutable render data for the current frame, used by the pipelined main loop to
+        draw frame N while frame N+1 is simulated on a worker thread. States that return
+        None are always updated and drawn in sequence on the main thread.
+        """
+        return None
+
+    def draw_snapshot(self, screen: pygame.Surface, snapshot: object) -> None:
+        self.draw(screen)
+
+    def next_state(self) -> StateFactory | None:
+        """What to switch to once this state is done (see StateFactory), else None."""
+        return None
+
+    def teardown(self) -> None:
+        """Called by main() when this state is replaced; drop anything heavy here."""
+        pass
+
+    def idle_timeout(self) -> float | None:
+        """
+        Seconds the main loop may sleep before this state needs another frame.
+
+        None means the state is animating and wants every frame. math.inf means
+        nothing on screen changes until the next input event.
+        """
         return None
@@ -1,16 +1,19 @@
 # states/end_state.py
 from __future__ import annotations
 
+import math
 import pygame
 
-from states.base_state import BaseState
+import audio
+from states.base_state import BaseState, StateFactory
 from settings import SCREEN_W, SCREEN_H, END_BG, FONTS_DIR
 from assets import load_image, load_font
 
 
 class EndState(BaseState):
     def __init__(self) -> None:
-        self._next: BaseState | None = None
+        self._next: StateFactory | None = None
+        audio.stop_ambience()
 
         self.bg: pygame.Surface | None = None
         try:
@@ -27,7 +30,7 @@ class EndState(BaseState):
 
         if event.key == pygame.K_r:
             from states.title_state import TitleState
-            self._next = TitleState()
+            self._next = TitleState
 
         elif event.key == pygame.K_ESCAPE:
             pygame.event.post(pygame.event.Event(pygame.QUIT))
@@ -35,11 +38,18 @@ class EndState(BaseState):
     def update(self, dt: float) -> None:
         pass
 
+    def idle_timeout(self) -> float | None:
+        return math.inf
+
     def draw(self, screen: pygame.Surface) -> None:
         if self.bg:
             screen.blit(self.bg, (0, 0))
         else:
             screen.fill((8, 18, 10))
 
-    def next_state(self) -> BaseState | None:
+    def next_state(self) -> StateFactory | None:
         return self._next
+
+    def teardown(self) -> None:
+        self._next = None
+        self.bg = None
@@ -0,0 +1,123 @@
+# states/endless_state.py
+from __future__ import annotations
+
+import random
+from collections import deque
+
+import audio
+import telemetry
+from assets import evict_image, load_image, load_mask
+from settings import (
+    AIR_START,
+    ENDLESS_BASE_LEVEL, ENDLESS_FLOW_AREA, ENDLESS_LOOKAHEAD, ENDLESS_PLATEAU,
+)
+from game.level_data import LEVELS
+from game.endless import WAVE_KEYS, wave_templates, endless_waves
+from game.spawn_table import SpawnTable, compile_spawn_table
+from states.level_state import LevelState
+
+
+class EndlessState(LevelState):
+    """
+    Endless mode: the base level's world with a new wave of item rules every time the
+    air target is reached. Waves are pulled from a lazy generator ENDLESS_LOOKAHEAD
+    ahead, and their item images are decoded one per frame while the current wave
+    plays, so a wave change never stalls on loading. Images only a finished wave used
+    are evicted, so memory stays flat however many waves a session runs. Decoding,
+    eviction and the wave switch itself run in after_update(), on the main thread.
+    """
+    SAVEABLE = False  # a resumed save would come back as the plain base level
+
+    def __init__(self) -> None:
+        self._waves = endless_waves(wave_templates(LEVELS), random.getrandbits(64),
+                                    ENDLESS_FLOW_AREA, plateau=ENDLESS_PLATEAU)
+        self._upcoming: deque[tuple[dict, SpawnTable | None]] = deque()
+        # (image path, size) of upcoming items not decoded yet.
+        self._pending: deque[tuple[str, tuple[int, int]]] = deque()
+
+        cfg, table = self._pull()
+        super().__init__(ENDLESS_BASE_LEVEL, cfg=cfg, spawn_table=table)
+        self._pending.clear()  # the first wave was loaded just now
+        self._wave_due = False
+        self.wave = cfg["wave"]
+        self._wave_t0 = self.t
+        while len(self._upcoming) < ENDLESS_LOOKAHEAD:
+            self._upcoming.append(self._pull())
+        telemetry.emit("wave_start", wave=self.wave, template=cfg["template"], pattern=cfg["pattern"])
+
+    # ---------- waves ----------
+
+    def _pull(self) -> tuple[dict, SpawnTable | None]:
+        """Generates the next wave and queues its images for decoding."""
+        cfg = {**LEVELS[ENDLESS_BASE_LEVEL], **next(self._waves)}
+        table = compile_spawn_table(cfg)
+        if table is not None:
+            for kind in table.kinds:
+                self._pending.append((self._item_image_path(kind, cfg), self._item_size_for_kind(kind, cfg)))
+        return cfg, table
+
+    def _level_config(self) -> tuple[dict, SpawnTable | None]:
+        # The wave keeps its own item rules; only the base level's world is reloaded.
+        wave = {k: self.cfg[k] for k in WAVE_KEYS if k in self.cfg}
+        return {**LEVELS[ENDLESS_BASE_LEVEL], **wave}, self.spawn_table
+
+    def _wave_paths(self, cfg: dict, table: SpawnTable | None) -> set[str]:
+        return {self._item_image_path(k, cfg) for k in table.kinds} if table is not None else set()
+
+    def _prefetch_step(self) -> None:
+        if not self._pending:
+            return
+        path, size = self._pending.popleft()
+        try:
+            load_image(path, scale_to=size)
+            load_mask(path, scale_to=size)
+        except Exception:
+            pass  # _load_item_image falls back to a labelled box for this kind
+
+    def _advance(self) -> None:
+        # Reached from update(); the switch loads and evicts images, so it waits for
+        # after_update().
+        self._wave_due = True
+
+    def _next_wave(self) -> None:
+        audio.play("level_up", priority=2)
+        telemetry.emit("wave_end", wave=self.wave, seconds=round(self.t - self._wave_t0, 2), air=self.air)
+
+        old = self._wave_paths(self.cfg, self.spawn_table)
+        cfg, table = self._upcoming.popleft()
+        self._upcoming.append(self._pull())
+        self._apply_config(cfg, table)
+        self.wave = cfg["wave"]
+        self._wave_t0 = self.t
+        self.air = AIR_START
+        self._spawn_items()
+
+        keep = self._wave_paths(cfg, table)
+        for up_cfg, up_table in self._upcoming:
+            keep |= self._wave_paths(up_cfg, up_table)
+        for path in old - keep:
+            evict_image(path)
+        telemetry.emit("wave_start", wave=self.wave, template=cfg["template"], pattern=cfg["pattern"])
+
+    # ---------- update/draw ----------
+
+    def update(self, dt: float) -> None:
+        # A finished wave holds still until after_update() has switched to the next.
+        if not self._wave_due:
+            super().update(dt)
+
+    def after_update(self) -> None:
+        if self._wave_due:
+            self._wave_due = False
+            self._next_wave()
+        elif not self.level_intro_active:
+            self._prefetch_step()
+
+    def _title(self) -> str:
+        return f"Endless: wave {self.wave + 1}"
+
+    def teardown(self) -> None:
+        super().teardown()
+        self._upcoming.clear()
+        self._pending.clear()
+        self._waves.close()
@@ -3,21 +3,43 @@ from __future__ import annotations
 
 import math
 import random
+from functools import partial
+
 import pygame
 
-from states.base_state import BaseState
-from assets import load_image
+import audio
+import telemetry
+from states.base_state import BaseState, StateFactory
+from assets import load_image, load_mask, prefetch_group
+from memreport import register_owner
 from settings import (
     SCREEN_W, SCREEN_H,
     PLAYER_SPEED,
     PLAYER_SIZE,
     AIR_MIN, AIR_MAX, AIR_START,
-    FOG_MIN_ALPHA, FOG_MAX_ALPHA,
+    FOG_MIN_ALPHA, FOG_MAX_ALPHA, FOG_LEVELS,
+    PARTICLE_CAP, GLOW_STEPS,
     UI_PADDING, UI_BAR_W, UI_BAR_H,
     LAST_LEVEL,
     PLAYER_SPRITES,
+    PLAYER_ANIM_FPS,
+    LEVEL_AMBIENCE,
+    TELEMETRY_AIR_INTERVAL,
+    NAV_CELL, NAV_RETARGET_INTERVAL,
 )
 from game.level_data import LEVELS
+from game.camera import Camera
+from game.animation import Animation, bake_animation, bake_facings, bake_mask
+from game.collision import overlaps, sweep_aabb, clip_move
+from game.tilemap import SingleImageMap, ChunkedMap
+from game.expiry import ExpiryQueue
+from game.navigation import NavGrid, FlowField
+from game.particles import ParticlePool
+from game.spawn_table import SpawnTable, spawn_table_for
+from game.broadphase import (
+    SweepAndPrune,
+    TAG_PICKUP, TAG_HAZARD, TAG_CAR, TAG_COLLECTIBLE, TAG_ITEMS,
+)
 
 
 # ---------- helpers ----------
@@ -28,9 +50,10 @@ def clamp(v: int, lo: int, hi: int) -> int:
 
 def _wrap_into_screen(rect: pygame.Rect, margin: int = 16) -> pygame.Rect:
     """
-    If level_data has coordinates larger than the screen (common when maps were designed
-    for a bigger canvas), wrap them back into the visible 960x540 playfield so the game
-    stays playable without adding a camera system.
+    Screen-sized levels only (see LevelState._place): coordinates outside the 960x540
+    playfield, left over from maps drawn on a bigger canvas, are wrapped back into
+    view. Levels with a real world size ("map_chunks") keep their coordinates and
+    scroll with the camera instead.
     """
     r = rect.copy()
     if r.w >= SCREEN_W - 2 * margin:
@@ -61,14 +84,95 @@ def _scale_rect(rect: pygame.Rect, scale: float, anchor: str = "center") -> pyga
     return r
 
 
+# ---------- fog ----------
+
+# Fog surface (or None for "no fog") for every integer air value in AIR_MIN..AIR_MAX.
+_FOG_BY_AIR: list[pygame.Surface | None] = []
+
+
+def _fog_table() -> list[pygame.Surface | None]:
+    """
+    Builds the fog lookup once. Air is quantized into FOG_LEVELS bands; every band is a
+    subsurface of one shared black buffer with its own fixed alpha, so picking a band
+    costs a list index and never touches surface state.
+    """
+    if _FOG_BY_AIR:
+        return _FOG_BY_AIR
+
+    base = pygame.Surface((SCREEN_W, SCREEN_H)).convert()
+    base.fill((0, 0, 0))
+
+    steps = max(1, FOG_LEVELS - 1)
+    bands: list[pygame.Surface | None] = []
+    for band in range(steps + 1):
+        alpha = int(FOG_MAX_ALPHA - (band / steps) * (FOG_MAX_ALPHA - FOG_MIN_ALPHA))
+        if alpha <= 0:
+            bands.append(None)
+            continue
+        surf = base.subsurface(base.get_rect())
+        surf.set_alpha(alpha)
+        bands.append(surf)
+
+    span = AIR_MAX - AIR_MIN
+    for air in range(AIR_MIN, AIR_MAX + 1):
+        band = ((air - AIR_MIN) * steps + span // 2) // span
+        _FOG_BY_AIR.append(bands[band])
+    return _FOG_BY_AIR
+
+
+register_owner("fog", lambda: [s for s in _FOG_BY_AIR if s is not None])
+
+
+# ---------- glow ----------
+
+# Item glow keyed by (item size, pulse step). The pulse is quantized to GLOW_STEPS, so
+# each item size needs GLOW_STEPS surfaces for the whole session instead of one per
+# item per frame.
+_GLOW_CACHE: dict[tuple[tuple[int, int], int], pygame.Surface] = {}
+
+
+def _glow_surface(size: tuple[int, int], step: int) -> pygame.Surface:
+    key = (size, step)
+    glow = _GLOW_CACHE.get(key)
+    if glow is None:
+        pulse = 0.65 + 0.35 * step / max(1, GLOW_STEPS - 1)  # 0.65..1.0
+        glow_w = int(size[0] * (1.15 + 0.10 * pulse))
+        glow_h = int(size[1] * (1.15 + 0.10 * pulse))
+        # A flat fill: surface alpha on a plain surface blends the same as per-pixel alpha.
+        glow = pygame.Surface((glow_w, glow_h)).convert()
+        glow.fill((60, 220, 200))
+        glow.set_alpha(int(70 * pulse))
+        _GLOW_CACHE[key] = glow
+    return glow
+
+
+register_owner("glow", lambda: list(_GLOW_CACHE.values()))
+
+
+# Which level_data keys feed which LevelState structures; a hot reload of level_data
+# only rebuilds the groups whose keys changed. Keys read only on entry ("spawn",
+# "intro") take effect the next time the level starts.
+_ITEM_RULE_KEYS = frozenset({"item_spawn", "item_assets", "item_sizes", "air_rules",
+                             "item_lifetime", "max_items", "flow_areas", "target_air"})
+_MAP_KEYS = frozenset({"map_path", "map_chunks"})
+_OBJECT_KEYS = frozenset({"static_objects", "moving_objects", "static_scale", "moving_scale"})
+
+
 # ---------- game objects ----------
 
 class Player:
-    def __init__(self, pos: tuple[int, int]) -> None:
+    def __init__(self, pos: tuple[int, int], bounds: pygame.Rect | None = None) -> None:
         self.rect = pygame.Rect(pos[0], pos[1], PLAYER_SIZE[0], PLAYER_SIZE[1])
         self.speed = PLAYER_SPEED
+        self.bounds = bounds or pygame.Rect(0, 0, SCREEN_W, SCREEN_H)
+
+        # Animation state, read by LevelState.draw to pick a baked frame.
+        self.moving = False
+        self.facing_left = False
+        self.anim_t = 0.0
 
-    def update(self, dt: float, keys: pygame.key.ScancodeWrapper) -> pygame.Rect:
+    def update(self, dt: float, keys: pygame.key.ScancodeWrapper,
+               obstacles: list[pygame.Rect] | None = None) -> pygame.Rect:
         dx = dy = 0.0
         if keys[pygame.K_a] or keys[pygame.K_LEFT]:
             dx -= 1
@@ -84,12 +188,31 @@ class Player:
             dx *= inv
             dy *= inv
 
+        return self.move(dt, dx, dy, obstacles)
+
+    def move(self, dt: float, dx: float, dy: float,
+             obstacles: list[pygame.Rect] | None = None) -> pygame.Rect:
+        """
+        Moves along a direction of length <= 1 (keys or a bot); returns the old rect.
+        The step is swept against `obstacles`, so even a long step (low tick rate, a
+        hitch) stops at a wall instead of passing through it.
+        """
+        self.moving = dx != 0 or dy != 0
+        if dx != 0:
+            self.facing_left = dx < 0
+        if self.moving:
+            self.anim_t += dt
+
         old = self.rect.copy()
-        self.rect.x += int(dx * self.speed * dt)
-        self.rect.y += int(dy * self.speed * dt)
+        step_x = int(dx * self.speed * dt)
+        step_y = int(dy * self.speed * dt)
+        if obstacles:
+            step_x, step_y = clip_move(self.rect, step_x, step_y, obstacles)
+        self.rect.x += step_x
+        self.rect.y += step_y
 
-        self.rect.x = max(0, min(SCREEN_W - self.rect.w, self.rect.x))
-        self.rect.y = max(0, min(SCREEN_H - self.rect.h, self.rect.y))
+        self.rect.x = max(self.bounds.left, min(self.bounds.right - self.rect.w, self.rect.x))
+        self.rect.y = max(self.bounds.top, min(self.bounds.bottom - self.rect.h, self.rect.y))
 
         return old
 
@@ -99,23 +222,31 @@ class StaticObject:
     def __init__(self, image_path: str, rect: pygame.Rect) -> None:
         self.image_path = image_path
         self.rect = rect
+        self.reload()
+
+    def reload(self) -> None:
         try:
-            self.image = load_image(image_path, scale_to=(rect.w, rect.h))
+            self.image = load_image(self.image_path, scale_to=(self.rect.w, self.rect.h))
         except Exception:
             self.image = None
 
 
 class Item:
     def __init__(self, kind: str, rect: pygame.Rect, image: pygame.Surface | None,
-                 spawn_time: float, lifetime: float,
+                 spawn_time: float, lifetime: float | None,
                  moving: bool = False, vx: float = 0, vy: float = 0,
                  bounds: pygame.Rect | None = None,
-                 on_exit: str = "bounce"):         
+                 on_exit: str = "bounce",
+                 tag: int = TAG_PICKUP,
+                 mask: pygame.mask.Mask | None = None):
         self.kind = kind
+        self.tag = tag
+        self.mask = mask
         self.rect = rect
         self.image = image
         self.spawn_time = spawn_time
-        self.lifetime = lifetime
+        self.lifetime = lifetime  # None: stays until collected or it flows away
+        self.expires_at = None if lifetime is None else spawn_time + lifetime
         self.moving = moving
         self.vx = vx
         self.vy = vy
@@ -131,25 +262,56 @@ class MovingObstacle:
         rect: pygame.Rect,
         vel: tuple[float, float],
         bounds: pygame.Rect,
+        tag: int = TAG_CAR,
+        air_delta: int = 0,
+        index: int = 0,
     ) -> None:
         self.image_path = image_path
         self.rect = rect
         self.vx, self.vy = vel
         self.bounds = bounds
-
+        self.tag = tag
+        self.air_delta = air_delta
+        self.index = index  # position in level_data "moving_objects" (for save states)
+        self.prev_rect = rect.copy()  # where the last update started (for swept hits)
+
+        self._vx0, self._vy0 = self.vx, self.vy
+        self.reload()
+
+    def reload(self) -> None:
+        # Mirrored variants for driving back along each axis are baked up front, so
+        # turning around is a dict lookup instead of a transform.
+        size = (self.rect.w, self.rect.h)
         try:
-            self.image = load_image(image_path, scale_to=(rect.w, rect.h))
+            self.frames = bake_facings(self.image_path, size,
+                                       horizontal=self._vx0 != 0, vertical=self._vy0 != 0)
+            self.masks = {k: bake_mask(self.image_path, size, k[0], k[1]) for k in self.frames}
         except Exception:
-            self.image = None
+            self.frames = {}
+            self.masks = {}
+        self.image = self.mask = None
+        self.face()
+
+    def face(self) -> None:
+        """Picks the baked variant for the current direction (mirrored if it reversed)."""
+        facing = (self.vx * self._vx0 < 0, self.vy * self._vy0 < 0)
+        self.image = self.frames.get(facing, self.image)
+        self.mask = self.masks.get(facing, self.mask)
 
     def update(self, dt: float) -> None:
+        self.prev_rect.topleft = self.rect.topleft
         self.rect.x += int(self.vx * dt)
         self.rect.y += int(self.vy * dt)
 
+        turned = False
         if self.rect.left < self.bounds.left or self.rect.right > self.bounds.right:
             self.vx *= -1
+            turned = True
         if self.rect.top < self.bounds.top or self.rect.bottom > self.bounds.bottom:
             self.vy *= -1
+            turned = True
+        if turned:
+            self.face()
 
         self.rect.left = max(self.bounds.left, self.rect.left)
         self.rect.right = min(self.bounds.right, self.rect.right)
@@ -157,6 +319,31 @@ class MovingObstacle:
         self.rect.bottom = min(self.bounds.bottom, self.rect.bottom)
 
 
+class LevelSnapshot:
+    """
+    Everything LevelState needs to draw one frame, flattened to screen positions.
+    Shares sprite surfaces with the live state but none of its mutable rects or lists,
+    so it stays valid while the next frame is simulated.
+    """
+    def __init__(self, state: "LevelState", view: pygame.Rect) -> None:
+        self.view = view
+        self.t = state.t
+        self.air = state.air
+        self.intro = state.level_intro_active
+
+        self.sprites: list[tuple[pygame.Surface, tuple[int, int]]] = []
+        self.outlines: list[tuple[tuple[int, int, int], pygame.Rect]] = []
+        self.glows: list[pygame.Rect] = []
+        self.items: list[tuple[pygame.Surface, tuple[int, int]]] = []
+        self.boxes: list[tuple[str, pygame.Rect]] = []
+        self.particles: list[tuple[pygame.Surface, tuple[int, int]]] = []
+
+        self.player_image: pygame.Surface | None = None
+        self.player_pos = (0, 0)
+        self.player_size = (0, 0)
+        self.fog: pygame.Surface | None = None
+
+
 # ---------- level state ----------
 
 class LevelState(BaseState):
@@ -178,77 +365,151 @@ class LevelState(BaseState):
     }
 
     DEFAULT_ITEM_SIZE = (84, 84)
-    def __init__(self, level_id: int) -> None:
+    # Whether SaveWriter snapshots this state (see savestate.py).
+    SAVEABLE = True
+
+    def __init__(self, level_id: int, populate: bool = True,
+                 cfg: dict | None = None, spawn_table: SpawnTable | None = None) -> None:
+        """
+        populate=False skips the initial item spawn (used when restoring a save).
+        cfg replaces LEVELS[level_id] (with its compiled spawn_table), e.g. an endless wave.
+        """
         self.level_id = level_id
-        self.cfg = LEVELS[level_id]
-        self._next: BaseState | None = None
-        
-        self.bg = load_image(self.cfg["map_path"], scale_to=(SCREEN_W, SCREEN_H))
+        self.cfg = LEVELS[level_id] if cfg is None else cfg
+        self._next: StateFactory | None = None
 
-        self.player = Player(self.cfg["spawn"])
+        # All gameplay randomness goes through this, so its state can be saved/restored.
+        # Seeded from the global generator, so random.seed() makes a whole run repeatable.
+        self.rng = random.Random(random.getrandbits(64))
 
-        self.player_image: pygame.Surface | None = None
-        try:
-            idle_path = PLAYER_SPRITES.get("idle")
-            if idle_path:
-                self.player_image = load_image(idle_path, scale_to=(self.player.rect.w, self.player.rect.h))
-        except Exception:
-            self.player_image = None
+        # Maps bigger than the screen ship as chunk directories ("map_chunks") and are
+        # streamed around the camera; classic levels are one screen-sized PNG.
+        self.map = self._make_map()
+        self.world = pygame.Rect(0, 0, *self.map.size)
+        self.camera = Camera((SCREEN_W, SCREEN_H), self.map.size)
+
+        self.player = Player(self.cfg["spawn"], self.world)
+        self.camera.follow(self.player.rect)
 
-        self.air_pickup: dict[str, int] = dict(self.cfg["air_rules"].get("pickup", {}))
-        self.air_step_on: dict[str, int] = dict(self.cfg["air_rules"].get("step_on", {}))
+        self._bake_player()
+
+        self._apply_config(self.cfg, spawn_table_for(level_id) if cfg is None else spawn_table)
 
         self.air = AIR_START
-        self.target_air = int(self.cfg["target_air"])
 
         self.collision_rects = []
         for rect_data in self.cfg.get("player_collision", []):
             self.collision_rects.append(pygame.Rect(*rect_data))
 
-        self.max_items = self.cfg.get("max_items", 5)
-
         self.spawn_interval = 2.0          
-        self.spawn_timer = random.uniform(0, self.spawn_interval) 
+        self.spawn_timer = self.rng.uniform(0, self.spawn_interval)
 
         self.spawn_blocked = []
         for rect_data in self.cfg.get("spawn_blocked_areas", []):
             self.spawn_blocked.append(pygame.Rect(*rect_data))
 
-        self.flow_areas = []
-        for fa in self.cfg.get("flow_areas", []):
-            area = {
-                "rect": pygame.Rect(*fa["rect"]),
-                "on_exit": fa.get("on_exit", "bounce")
-            }
-            if "vel" in fa:
-                area["vel"] = fa["vel"]          
-            if "speed" in fa:
-                area["speed"] = fa["speed"]     
-            self.flow_areas.append(area)
-
-        
-        self.fog_surface = pygame.Surface((SCREEN_W, SCREEN_H))
-        self.fog_surface.fill((0, 0, 0))
-        self.fog_alpha = 0
+        self._fog_by_air = _fog_table()
+        self.fog_surface: pygame.Surface | None = None
 
         self.font = pygame.font.Font(None, 22)
         self.big_font = pygame.font.Font(None, 34)
 
         self.t = 0.0  
 
+        self.particles = ParticlePool(PARTICLE_CAP)
+
+        self._air_sample_t = 0.0
+        telemetry.emit("level_start", level=level_id, resumed=not populate)
+
+        audio.preload(["pickup", "hazard", "car_hit", "level_up"])
+        if cfg is None:
+            # Pull the next screen's bundled bytes in while this level is played.
+            prefetch_group(f"level{level_id + 1}" if level_id < LAST_LEVEL else "end")
+        audio.play_ambience(LEVEL_AMBIENCE.get(level_id))
+
         self.level_intro_active = True
 
+        self._broadphase = SweepAndPrune()
         self.static_objects: list[StaticObject] = []
         self.moving_obstacles: list[MovingObstacle] = []
         self._load_world_objects()
 
+        # Everything an item may not spawn on that never moves, checked in one collidelist.
+        self._spawn_static_blocked = [o.rect for o in self.static_objects] + self.spawn_blocked
+
+        # Walkable cells for player-sized agents, built once. The flow field toward the
+        # pickups only exists (and is kept in sync) while something steers by it.
+        self.nav_grid = NavGrid(self.world, self.collision_rects, self.player.rect.size, NAV_CELL)
+        self.nav_field: FlowField | None = None
+        self._nav_retarget = 0.0
+        self.autopilot = False
+
         self.items: list[Item] = []
-        self._spawn_items()  
+        self._expiry: ExpiryQueue[Item] = ExpiryQueue()
+        if populate:
+            self._spawn_items()
 
         self._car_hit_cooldown = 0.0
         
+    # ---------- level config ----------
+
+    def _apply_config(self, cfg: dict, spawn_table: SpawnTable | None) -> None:
+        """
+        The item rules of a level: what spawns, what it is worth, how it drifts and the
+        air target. The world (map, walls, spawn zones) is not touched, so endless mode
+        can swap these per wave in place.
+        """
+        self.cfg = cfg
+        self.air_pickup: dict[str, int] = dict(cfg["air_rules"].get("pickup", {}))
+        self.air_step_on: dict[str, int] = dict(cfg["air_rules"].get("step_on", {}))
+        self.target_air = int(cfg["target_air"])
+
+        self.max_items = cfg.get("max_items", 5)
+        self.item_lifetime: tuple[float, float] | None = cfg.get("item_lifetime", (8.0, 15.0))
+
+        self.flow_areas = []
+        for fa in cfg.get("flow_areas", []):
+            area = {
+                "rect": pygame.Rect(*fa["rect"]),
+                "on_exit": fa.get("on_exit", "bounce")
+            }
+            if "vel" in fa:
+                area["vel"] = fa["vel"]
+            if "speed" in fa:
+                area["speed"] = fa["speed"]
+            self.flow_areas.append(area)
+
+        self.spawn_table = spawn_table
+        self._kind_info: dict[str, tuple[tuple[int, int], pygame.Surface | None, pygame.mask.Mask | None, int]] = {}
+        if spawn_table is not None:
+            for kind in spawn_table.kinds:
+                size = self._item_size_for_kind(kind)
+                tag = TAG_HAZARD if kind in self.air_step_on else TAG_PICKUP
+                image, mask = self._load_item_image(kind, size)
+                self._kind_info[kind] = (size, image, mask, tag)
+
     # ---------- world loading ----------
 
+    def _make_map(self) -> SingleImageMap | ChunkedMap:
+        if "map_chunks" in self.cfg:
+            return ChunkedMap(self.cfg["map_chunks"])
+        return SingleImageMap(self.cfg["map_path"], (SCREEN_W, SCREEN_H))
+
+    def _bake_player(self) -> None:
+        # Keyed by ("idle" | "walk", facing_left); all frames are baked here, once.
+        self.player_anims: dict[tuple[str, bool], Animation] = {}
+        size = (self.player.rect.w, self.player.rect.h)
+        idle = [p for p in (PLAYER_SPRITES.get("idle"),) if p]
+        walk = [p for p in (PLAYER_SPRITES.get("walk1"), PLAYER_SPRITES.get("walk2")) if p] or idle
+        try:
+            for left in (False, True):
+                if idle:
+                    self.player_anims[("idle", left)] = bake_animation(idle, size, PLAYER_ANIM_FPS, flip_x=left)
+                if walk:
+                    self.player_anims[("walk", left)] = bake_animation(walk, size, PLAYER_ANIM_FPS, flip_x=left)
+        except Exception:
+            self.player_anims = {}
+
     def _load_world_objects(self) -> None:
         static_scale = float(self.cfg.get("static_scale", 1.25))
         moving_scale = float(self.cfg.get("moving_scale", 1.25))
@@ -256,105 +517,139 @@ class LevelState(BaseState):
         for so in self.cfg.get("static_objects", []):
             r = pygame.Rect(*so["rect"])
             r = _scale_rect(r, static_scale, anchor="center")
-            r = _wrap_into_screen(r, margin=16)
+            r = self._place(r)
             self.static_objects.append(StaticObject(so["image"], r))
 
-        for mo in self.cfg.get("moving_objects", []):
+        for index, mo in enumerate(self.cfg.get("moving_objects", [])):
             r = pygame.Rect(*mo["rect"])
             bminx, bminy, bmaxx, bmaxy = mo["bounds"]
             bounds_rect = pygame.Rect(bminx, bminy, bmaxx - bminx, bmaxy - bminy)
 
-            is_car = ("car" in mo["image"].lower())
-            if not is_car:
+            tag, air_delta = self._classify_moving(mo)
+            if tag != TAG_CAR:
                 r = _scale_rect(r, moving_scale, anchor="center")
-            r = _wrap_into_screen(r, margin=16)
+            r = self._place(r)
+
+            bounds_rect = self._place(bounds_rect)
+            obstacle = MovingObstacle(mo["image"], r, mo["vel"], bounds_rect,
+                                      tag=tag, air_delta=air_delta, index=index)
+            self.moving_obstacles.append(obstacle)
+            self._broadphase.add(obstacle)
+
+    def _place(self, rect: pygame.Rect) -> pygame.Rect:
+        # Screen-sized levels fold stray coordinates back into view; levels with a real
+        # world size keep their coordinates and rely on the camera.
+        if self.world.size == (SCREEN_W, SCREEN_H):
+            return _wrap_into_screen(rect, margin=16)
+        return rect
+
+    def _classify_moving(self, mo: dict) -> tuple[int, int]:
+        """
+        Resolves a moving object's kind once at load time: (tag, air delta on pickup).
+        level_data can set "kind": "car"; otherwise we go by the image file name.
+        """
+        kind = mo.get("kind")
+        p = mo["image"].lower()
+
+        if kind == "car" or (kind is None and "car" in p):
+            return TAG_CAR, 0
+
+        if "chemical" in p or "oil" in p or "batteries" in p or "net" in p:
+            return TAG_COLLECTIBLE, -abs(int(self.air_step_on.get("chemical", -8)))  # negative
 
-            bounds_rect = _wrap_into_screen(bounds_rect, margin=16)
-            self.moving_obstacles.append(MovingObstacle(mo["image"], r, mo["vel"], bounds_rect))
+        return TAG_COLLECTIBLE, 6
 
     # ---------- item spawning / assets ----------
 
-    def _item_size_for_kind(self, kind: str) -> tuple[int, int]:
-        sizes = self.cfg.get("item_sizes", {})
+    def _item_size_for_kind(self, kind: str, cfg: dict | None = None) -> tuple[int, int]:
+        sizes = (cfg or self.cfg).get("item_sizes", {})
         if isinstance(sizes, dict) and kind in sizes:
             w, h = sizes[kind]
             return int(w), int(h)
         return self.DEFAULT_ITEM_SIZE
 
-    def _load_item_image(self, kind: str, size: tuple[int, int]) -> pygame.Surface | None:
-        path = self.cfg.get("item_assets", {}).get(kind) or self.ITEM_ASSETS.get(kind)
-        if not path:
-            path = f"assets/{kind}.png"
+    def _item_image_path(self, kind: str, cfg: dict | None = None) -> str:
+        path = (cfg or self.cfg).get("item_assets", {}).get(kind) or self.ITEM_ASSETS.get(kind)
+        return path or f"assets/{kind}.png"
+
+    def _load_item_image(self, kind: str, size: tuple[int, int],
+                         cfg: dict | None = None) -> tuple[pygame.Surface | None, pygame.mask.Mask | None]:
+        path = self._item_image_path(kind, cfg)
         try:
-            return load_image(path, scale_to=size)
+            return load_image(path, scale_to=size), load_mask(path, scale_to=size)
         except Exception:
-            return None
+            return None, None
 
     def _spawn_items(self) -> None:
-        self.items = []
+        for it in list(self.items):
+            self._remove_item(it)
         for _ in range(self.max_items):
             self._spawn_one_item()
 
     def _spawn_one_item(self) -> None:
-        kinds = list(self.cfg.get("item_spawn", {}).get("types", []))
-        for k in list(self.air_pickup.keys()) + list(self.air_step_on.keys()):
-            if k not in kinds:
-                kinds.append(k)
-        if not kinds:
+        if self.spawn_table is None:
             return
 
-        kind = random.choice(kinds)
-        w, h = self._item_size_for_kind(kind)
-
-        blocked = [o.rect.copy() for o in self.static_objects]
-        blocked.append(self.player.rect.copy())
-        blocked.extend(it.rect for it in self.items)
+        kind = self.spawn_table.sample(self.rng)
+        (w, h), img, mask, tag = self._kind_info[kind]
 
-        rect = self._random_free_rect(blocked, w, h)
-        img = self._load_item_image(kind, (w, h))
+        rect = self._random_free_rect(w, h)
+        it = Item(kind, rect, img, self.t, self._roll_lifetime(), tag=tag, mask=mask)
+        self._set_item_flow(it)
+        self._add_item(it)
 
-        if self.level_id == 3:
-            lifetime = 1e9   
-        else:
-            lifetime = random.uniform(8.0, 15.0)
-
-        moving = False
-        
-        vx = vy = 0
-        bounds = None
-        on_exit = "bounce"
+    def _roll_lifetime(self) -> float | None:
+        if self.item_lifetime is None:
+            return None
+        return self.rng.uniform(*self.item_lifetime)
+
+    def _set_item_flow(self, it: Item) -> None:
+        """Gives the item the drift of the first flow area it touches, or none."""
+        it.moving = False
+        it.vx = it.vy = 0
+        it.bounds = None
+        it.on_exit = "bounce"
         for fa in self.flow_areas:
-            if rect.colliderect(fa["rect"]):
-                moving = True
-                bounds = fa["rect"]
-                on_exit = fa["on_exit"]
+            if it.rect.colliderect(fa["rect"]):
+                it.moving = True
+                it.bounds = fa["rect"]
+                it.on_exit = fa["on_exit"]
                 if "vel" in fa:
-                    vx, vy = fa["vel"]
+                    it.vx, it.vy = fa["vel"]
                 elif "speed" in fa:
-                    direction = random.choice([-1, 1])
-                    vx = fa["speed"] * direction
-                    vy = 0
-                else:
-                    vx = vy = 0
+                    direction = self.rng.choice([-1, 1])
+                    it.vx = fa["speed"] * direction
                 break
 
-        self.items.append(Item(kind, rect, img, self.t, lifetime,
-                               moving=moving, vx=vx, vy=vy, bounds=bounds,
-                               on_exit=on_exit))  
-
-    def _random_free_rect(self, blocked: list[pygame.Rect], w: int, h: int) -> pygame.Rect:
+    def _add_item(self, it: Item) -> None:
+        self.items.append(it)
+        self._broadphase.add(it)
+        self._expiry.push(it, it.expires_at)
+        if self.nav_field is not None and it.tag == TAG_PICKUP:
+            self.nav_field.set_target(it, it.rect.center)
+
+    def _remove_item(self, it: Item) -> None:
+        self.items.remove(it)
+        self._broadphase.remove(it)
+        self._expiry.discard(it)
+        if self.nav_field is not None:
+            self.nav_field.remove_target(it)
+
+    def _random_free_rect(self, w: int, h: int) -> pygame.Rect:
         margin_x = 24
         margin_y = 10
-        max_x = max(margin_x, SCREEN_W - margin_x - w)
-        max_y = max(margin_y, SCREEN_H - margin_y - h)
+        max_x = max(margin_x, self.world.w - margin_x - w)
+        max_y = max(margin_y, self.world.h - margin_y - h)
 
         for _ in range(800):
-            x = random.randint(margin_x, max_x)
-            y = random.randint(margin_y, max_y)
+            x = self.rng.randint(margin_x, max_x)
+            y = self.rng.randint(margin_y, max_y)
             r = pygame.Rect(x, y, w, h)
-            if any(r.colliderect(b) for b in blocked):
+            if r.collidelist(self._spawn_static_blocked) != -1:
+                continue
+            if r.colliderect(self.player.rect):
                 continue
-            if any(r.colliderect(area) for area in self.spawn_blocked):
+            if any(r.colliderect(it.rect) for it in self.items):
                 continue
             return r
         return pygame.Rect(margin_x, margin_y, w, h)
@@ -379,41 +674,103 @@ class LevelState(BaseState):
         if event.key == pygame.K_n:
             self.air = self.target_air
 
+        if event.key == pygame.K_b:
+            self.set_autopilot(not self.autopilot)
+
+    # ---------- navigation ----------
+
+    def set_autopilot(self, on: bool) -> None:
+        """Dev/test bot: the player walks the flow field to the nearest pickup."""
+        self.autopilot = on
+        if on and self.nav_field is None:
+            self.nav_field = FlowField(self.nav_grid)
+            for it in self.items:
+                if it.tag == TAG_PICKUP:
+                    self.nav_field.set_target(it, it.rect.center)
+        elif not on:
+            self.nav_field = None
+
+    def _retarget_moving(self, dt: float) -> None:
+        # Flowing items change cell often; checking them a few times a second is plenty.
+        self._nav_retarget -= dt
+        if self._nav_retarget > 0:
+            return
+        self._nav_retarget = NAV_RETARGET_INTERVAL
+        for it in self.items:
+            if it.moving and it.tag == TAG_PICKUP:
+                self.nav_field.set_target(it, it.rect.center)
+
     # ---------- gameplay rules ----------
 
-    def _is_collectible_moving(self, image_path: str) -> bool:
-        return ("car" not in image_path.lower())
+    def _player_mask(self) -> pygame.mask.Mask | None:
+        anim = self.player_anims.get(("walk" if self.player.moving else "idle", self.player.facing_left))
+        return anim.mask_at(self.player.anim_t) if anim is not None else None
+
+    def _touching(self, tags: int):
+        """First object with one of `tags` whose visible pixels touch the player's."""
+        rect = self.player.rect
+        mask = self._player_mask()
+        for obj in self._broadphase.query(rect, tags):
+            if overlaps(rect, mask, obj.rect, obj.mask):
+                return obj
+        return None
+
+    def _swept_car_hit(self, player_from: pygame.Rect) -> bool:
+        """
+        Did a car cross the player during this step? Only a step longer than the
+        player itself can jump clean over a car between two overlap tests, so only
+        those are swept: each car's start rect moves by its motion relative to the
+        player's, and a hit must still be confirmed pixel-accurately along the path
+        from the contact point (the rects touching is not enough).
+        """
+        px = self.player.rect.x - player_from.x
+        py = self.player.rect.y - player_from.y
+        mask = self._player_mask()
+        for mo in self.moving_obstacles:
+            if mo.tag != TAG_CAR:
+                continue
+            rel_x = mo.rect.x - mo.prev_rect.x - px
+            rel_y = mo.rect.y - mo.prev_rect.y - py
+            if abs(rel_x) < player_from.w and abs(rel_y) < player_from.h:
+                continue  # the end-of-step overlap test cannot miss this one
+            t = sweep_aabb(mo.prev_rect, rel_x, rel_y, player_from)
+            if t is None:
+                continue
+            # Sample the rest of the path at most half a car apart.
+            spacing = max(1, min(mo.rect.w, mo.rect.h) // 2)
+            n = max(1, math.ceil(math.hypot(rel_x, rel_y) * (1.0 - t) / spacing))
+            for k in range(n + 1):
+                s = t + (1.0 - t) * k / n
+                at = mo.prev_rect.move(round(rel_x * s), round(rel_y * s))
+                if overlaps(player_from, mask, at, mo.mask):
+                    return True
+        return False
 
     def _try_pickup(self) -> None:
-        for i, it in enumerate(self.items):
-            if self.player.rect.colliderect(it.rect):
-                gain = int(self.air_pickup.get(it.kind, 0))
-                self.air += gain
-                self.air = clamp(self.air, AIR_MIN, AIR_MAX)
-                self.items.pop(i)
-                return
-
-        for i, mo in enumerate(self.moving_obstacles):
-            if self.player.rect.colliderect(mo.rect):
-                if not self._is_collectible_moving(mo.image_path):
-                    return
-                delta = self._delta_for_asset_path(mo.image_path)
-                if delta != 0:
-                    self.air += delta
-                    self.air = clamp(self.air, AIR_MIN, AIR_MAX)
-                    self.moving_obstacles.pop(i)
-                return
-
-    def _delta_for_asset_path(self, image_path: str) -> int:
-        p = image_path.lower()
-
-        if "chemical" in p or "oil" in p or "batteries" in p or "net" in p:
-            return -abs(int(self.air_step_on.get("chemical", -8)))  # negative
-
-        if "car" in p:
-            return 0
+        self._broadphase.update()
+
+        it = self._touching(TAG_ITEMS)
+        if it is not None:
+            gain = int(self.air_pickup.get(it.kind, 0))
+            self.air += gain
+            self.air = clamp(self.air, AIR_MIN, AIR_MAX)
+            self._remove_item(it)
+            telemetry.emit("pickup", level=self.level_id, kind=it.kind, air=self.air)
+            self.particles.emit(it.rect.center, "pickup" if gain >= 0 else "hazard", 18)
+            audio.play("pickup" if gain >= 0 else "hazard")
+            return
 
-        return 6
+        mo = self._touching(TAG_CAR | TAG_COLLECTIBLE)
+        if mo is None or mo.tag == TAG_CAR:
+            return
+        if mo.air_delta != 0:
+            self.air += mo.air_delta
+            self.air = clamp(self.air, AIR_MIN, AIR_MAX)
+            self.moving_obstacles.remove(mo)
+            self._broadphase.remove(mo)
+            telemetry.emit("pickup", level=self.level_id, kind=mo.image_path, air=self.air)
+            self.particles.emit(mo.rect.center, "pickup" if mo.air_delta > 0 else "hazard", 18)
+            audio.play("pickup" if mo.air_delta > 0 else "hazard")
 
     # ---------- update/draw ----------
 
@@ -422,65 +779,75 @@ class LevelState(BaseState):
         if self.level_intro_active:
             return
 
-        keys = pygame.key.get_pressed()
-        old_rect = self.player.rect.copy()
-        self.player.update(dt, keys)
+        if self.autopilot:
+            old_rect = self.player.move(dt, *self.nav_field.step_toward(self.player.rect.center),
+                                        self.collision_rects)
+        else:
+            old_rect = self.player.update(dt, pygame.key.get_pressed(), self.collision_rects)
 
-        for rect in self.collision_rects:
-            if self.player.rect.colliderect(rect):
-                self.player.rect = old_rect
-                break
+        self.camera.follow(self.player.rect)
 
         for mo in self.moving_obstacles:
             mo.update(dt)
 
-        for i, it in enumerate(self.items):
-            if it.kind in self.air_step_on and self.player.rect.colliderect(it.rect):
-                self.air += int(self.air_step_on[it.kind])  
-                self.items.pop(i)
-                break
+        self._broadphase.update()
+
+        hazard = self._touching(TAG_HAZARD)
+        if hazard is not None:
+            self.air += int(self.air_step_on[hazard.kind])
+            self._remove_item(hazard)
+            telemetry.emit("hazard", level=self.level_id, kind=hazard.kind, air=self.air)
+            self.particles.emit(hazard.rect.center, "hazard", 24, speed=90.0, life=0.8)
+            audio.play("hazard", priority=1)
+
+        if self.autopilot and self._touching(TAG_PICKUP) is not None:
+            self._try_pickup()
 
         if self._car_hit_cooldown > 0:
             self._car_hit_cooldown = max(0.0, self._car_hit_cooldown - dt)
-        else:
-            for mo in self.moving_obstacles:
-                if ("car" in mo.image_path.lower()) and self.player.rect.colliderect(mo.rect):
-                    self.air -= 6
-                    self._car_hit_cooldown = 0.6
-                    break
-        new_items = []
-        for it in self.items:
-            if it.moving and it.bounds is not None:
-                it.rect.x += it.vx * dt
-                it.rect.y += it.vy * dt
-
-                if it.on_exit == "bounce":
-                    if it.rect.left < it.bounds.left:
-                        it.rect.left = it.bounds.left
-                        it.vx = -it.vx
-                    if it.rect.right > it.bounds.right:
-                        it.rect.right = it.bounds.right
-                        it.vx = -it.vx
-                    if it.rect.top < it.bounds.top:
-                        it.rect.top = it.bounds.top
-                        it.vy = -it.vy
-                    if it.rect.bottom > it.bounds.bottom:
-                        it.rect.bottom = it.bounds.bottom
-                        it.vy = -it.vy
-                    new_items.append(it)
-
-                elif it.on_exit == "remove":
-                    if (it.rect.right < it.bounds.left or
-                        it.rect.left > it.bounds.right or
-                        it.rect.bottom < it.bounds.top or
-                        it.rect.top > it.bounds.bottom):
-                        continue          
-                    new_items.append(it)
+        elif self._touching(TAG_CAR) is not None or self._swept_car_hit(old_rect):
+            self.air -= 6
+            self._car_hit_cooldown = 0.6
+            telemetry.emit("car_hit", level=self.level_id, air=self.air)
+            self.particles.emit(self.player.rect.center, "car", 20, speed=180.0, life=0.5)
+            audio.play("car_hit", priority=1)
 
-            else:
-                new_items.append(it)
+        self.particles.update(dt)
+
+        gone: list[Item] = []
+        for it in self.items:
+            if not it.moving or it.bounds is None:
+                continue
 
-        self.items = new_items
+            it.rect.x += it.vx * dt
+            it.rect.y += it.vy * dt
+
+            if it.on_exit == "bounce":
+                if it.rect.left < it.bounds.left:
+                    it.rect.left = it.bounds.left
+                    it.vx = -it.vx
+                if it.rect.right > it.bounds.right:
+                    it.rect.right = it.bounds.right
+                    it.vx = -it.vx
+                if it.rect.top < it.bounds.top:
+                    it.rect.top = it.bounds.top
+                    it.vy = -it.vy
+                if it.rect.bottom > it.bounds.bottom:
+                    it.rect.bottom = it.bounds.bottom
+                    it.vy = -it.vy
+
+            elif it.on_exit == "remove":
+                if (it.rect.right < it.bounds.left or
+                    it.rect.left > it.bounds.right or
+                    it.rect.bottom < it.bounds.top or
+                    it.rect.top > it.bounds.bottom):
+                    gone.append(it)
+
+        for it in gone:
+            self._remove_item(it)
+
+        if self.nav_field is not None:
+            self._retarget_moving(dt)
 
         if not self.level_intro_active:
             self.spawn_timer -= dt
@@ -490,85 +857,219 @@ class LevelState(BaseState):
 
         self.air = clamp(self.air, AIR_MIN, AIR_MAX)
 
-        current_time = self.t
-        self.items = [it for it in self.items if current_time - it.spawn_time < it.lifetime]
+        for it in self._expiry.pop_expired(self.t):
+            self._remove_item(it)
 
-        self.fog_alpha = int(FOG_MAX_ALPHA - (self.air / AIR_MAX) * (FOG_MAX_ALPHA - FOG_MIN_ALPHA))
-        self.fog_alpha = clamp(self.fog_alpha, FOG_MIN_ALPHA, FOG_MAX_ALPHA)
-        self.fog_surface.set_alpha(self.fog_alpha)
+        self.fog_surface = self._fog_by_air[self.air - AIR_MIN]
+
+        self._air_sample_t -= dt
+        if self._air_sample_t <= 0:
+            self._air_sample_t = TELEMETRY_AIR_INTERVAL
+            telemetry.emit("air", level=self.level_id, air=self.air, items=len(self.items))
 
         if self.air >= self.target_air:
             self._advance()
 
     def _advance(self) -> None:
+        audio.play("level_up", priority=2)
+        telemetry.emit("level_end", level=self.level_id, seconds=round(self.t, 2), air=self.air)
         if self.level_id < LAST_LEVEL:
-            self._next = LevelState(self.level_id + 1)
+            self._next = partial(LevelState, self.level_id + 1)
         else:
             from states.end_state import EndState
-            self._next = EndState()
+            self._next = EndState
+
+    # ---------- hot reload ----------
+
+    def _level_config(self) -> tuple[dict, SpawnTable | None]:
+        """The config (and spawn table) this state is built from, as level_data has it now."""
+        return LEVELS[self.level_id], spawn_table_for(self.level_id)
+
+    def reload_config(self, changed: set[str]) -> None:
+        """
+        Rebuilds what depends on the changed level_data keys, in place: the player,
+        air, timers and items on the floor all carry on.
+        """
+        cfg, table = self._level_config()
+        if changed & _ITEM_RULE_KEYS:
+            self._apply_config(cfg, table)
+            # Items already out take on their kind's new image and rules; kinds that no
+            # longer spawn are removed. Air deltas are looked up by kind on contact, so
+            # they apply as is; lifetimes and drift are rolled again from the new rules,
+            # counted from when the item spawned.
+            for it in list(self.items):
+                self._remove_item(it)
+                info = self._kind_info.get(it.kind)
+                if info is None:
+                    continue
+                size, it.image, it.mask, it.tag = info
+                if it.rect.size != size:
+                    center = it.rect.center
+                    it.rect.size = size
+                    it.rect.center = center
+                if "item_lifetime" in changed:
+                    it.lifetime = self._roll_lifetime()
+                    it.expires_at = None if it.lifetime is None else it.spawn_time + it.lifetime
+                if "flow_areas" in changed:
+                    self._set_item_flow(it)
+                self._add_item(it)
+        else:
+            self.cfg = cfg
+
+        rebuild_nav = False
+        if changed & _MAP_KEYS:
+            self.map.release()
+            self.map = self._make_map()
+            if self.map.size != self.world.size:
+                self.world = pygame.Rect(0, 0, *self.map.size)
+                self.camera = Camera((SCREEN_W, SCREEN_H), self.map.size)
+                self.player.bounds = self.world
+                rebuild_nav = True
+
+        if "player_collision" in changed:
+            self.collision_rects = [pygame.Rect(*r) for r in cfg.get("player_collision", [])]
+            rebuild_nav = True
+
+        if changed & _OBJECT_KEYS:
+            for mo in self.moving_obstacles:
+                self._broadphase.remove(mo)
+            self.static_objects.clear()
+            self.moving_obstacles.clear()
+            self._load_world_objects()
+
+        if "spawn_blocked_areas" in changed:
+            self.spawn_blocked = [pygame.Rect(*r) for r in cfg.get("spawn_blocked_areas", [])]
+        self._spawn_static_blocked = [o.rect for o in self.static_objects] + self.spawn_blocked
+
+        if rebuild_nav:
+            self.nav_grid = NavGrid(self.world, self.collision_rects, self.player.rect.size, NAV_CELL)
+            if self.nav_field is not None:
+                self.nav_field = None
+                self.set_autopilot(True)
+
+    def reload_asset(self, path: str) -> None:
+        """Swaps in the new pixels of image `path` (its cache entries are already evicted)."""
+        self.map.reload(path)
+        for obj in self.static_objects:
+            if obj.image_path == path:
+                obj.reload()
+        for mo in self.moving_obstacles:
+            if mo.image_path == path:
+                mo.reload()
+        if path in PLAYER_SPRITES.values():
+            self._bake_player()
+
+        kinds = [k for k in self._kind_info if self._item_image_path(k) == path]
+        for kind in kinds:
+            size, _, _, tag = self._kind_info[kind]
+            image, mask = self._load_item_image(kind, size)
+            self._kind_info[kind] = (size, image, mask, tag)
+        for it in self.items:
+            if it.kind in kinds:
+                _, it.image, it.mask, _ = self._kind_info[it.kind]
 
-    def draw(self, screen: pygame.Surface) -> None:
-        screen.blit(self.bg, (0, 0))
+    # ---------- snapshot / draw ----------
+
+    def export_snapshot(self) -> "LevelSnapshot":
+        view = self.camera.view
+        ox, oy = -view.x, -view.y
+        snap = LevelSnapshot(self, view.copy())
 
+        # Entities outside the viewport are culled here, before any blit work.
         for obj in self.static_objects:
+            if not view.colliderect(obj.rect):
+                continue
             if obj.image is not None:
-                screen.blit(obj.image, obj.rect)
+                snap.sprites.append((obj.image, (obj.rect.x + ox, obj.rect.y + oy)))
             else:
-                pygame.draw.rect(screen, (110, 110, 110), obj.rect, 2)
+                snap.outlines.append(((110, 110, 110), obj.rect.move(ox, oy)))
 
         for mo in self.moving_obstacles:
+            if not view.colliderect(mo.rect):
+                continue
             if mo.image is not None:
-                screen.blit(mo.image, mo.rect)
+                snap.sprites.append((mo.image, (mo.rect.x + ox, mo.rect.y + oy)))
             else:
-                pygame.draw.rect(screen, (200, 80, 80), mo.rect, 2)
+                snap.outlines.append(((200, 80, 80), mo.rect.move(ox, oy)))
 
         for it in self.items:
-            pulse = 0.65 + 0.35 * (0.5 + 0.5 * math.sin(self.t * 4.0))  # 0.65..1.0
-            glow_w = int(it.rect.w * (1.15 + 0.10 * pulse))
-            glow_h = int(it.rect.h * (1.15 + 0.10 * pulse))
-
-            glow = pygame.Surface((glow_w, glow_h), pygame.SRCALPHA)
-            glow.fill((60, 220, 200, int(70 * pulse)))
-            glow_rect = glow.get_rect(center=it.rect.center)
-            screen.blit(glow, glow_rect)
-
+            if not view.colliderect(it.rect):
+                continue
+            r = it.rect.move(ox, oy)
+            snap.glows.append(r)
             if it.image is not None:
-                screen.blit(it.image, it.rect)
+                snap.items.append((it.image, r.topleft))
             else:
-                box = pygame.Surface((it.rect.w, it.rect.h), pygame.SRCALPHA)
-                box.fill((240, 240, 0, 220))
-                screen.blit(box, it.rect)
-                label = self.font.render(it.kind.replace("_", " "), True, (0, 0, 0))
-                screen.blit(label, (it.rect.x + 6, it.rect.y + 6))
-
-        if self.player_image is not None:
-            screen.blit(self.player_image, self.player.rect)
+                snap.boxes.append((it.kind, r))
+
+        snap.player_pos = self.camera.to_screen(self.player.rect)
+        snap.player_size = self.player.rect.size
+        anim = self.player_anims.get(("walk" if self.player.moving else "idle", self.player.facing_left))
+        snap.player_image = anim.frame_at(self.player.anim_t) if anim is not None else None
+
+        snap.particles = self.particles.blit_list(view)
+        snap.fog = None if self.level_intro_active else self.fog_surface
+        return snap
+
+    def draw(self, screen: pygame.Surface) -> None:
+        self.draw_snapshot(screen, self.export_snapshot())
+
+    def draw_snapshot(self, screen: pygame.Surface, snap: "LevelSnapshot") -> None:
+        """
+        Renders a snapshot. Only reads the snapshot and per-level constants (map, fonts,
+        air rules), so it may run while another thread updates this state.
+        """
+        self.map.draw(screen, snap.view)
+
+        screen.blits(snap.sprites, doreturn=False)
+        for color, rect in snap.outlines:
+            pygame.draw.rect(screen, color, rect, 2)
+
+        step = round((0.5 + 0.5 * math.sin(snap.t * 4.0)) * (GLOW_STEPS - 1))
+        glows = []
+        for r in snap.glows:
+            glow = _glow_surface(r.size, step)
+            glows.append((glow, glow.get_rect(center=r.center)))
+        screen.blits(glows, doreturn=False)
+
+        screen.blits(snap.items, doreturn=False)
+        for kind, r in snap.boxes:
+            box = pygame.Surface(r.size, pygame.SRCALPHA)
+            box.fill((240, 240, 0, 220))
+            screen.blit(box, r)
+            label = self.font.render(kind.replace("_", " "), True, (0, 0, 0))
+            screen.blit(label, (r.x + 6, r.y + 6))
+
+        screen.blits(snap.particles, doreturn=False)
+
+        if snap.player_image is not None:
+            screen.blit(snap.player_image, snap.player_pos)
         else:
-            pygame.draw.rect(screen, (240, 240, 240), self.player.rect)
+            pygame.draw.rect(screen, (240, 240, 240), pygame.Rect(snap.player_pos, snap.player_size))
 
-        if not self.level_intro_active:
-            screen.blit(self.fog_surface, (0, 0))
+        if snap.fog is not None:
+            screen.blit(snap.fog, (0, 0))
 
-        self._draw_ui(screen)
+        self._draw_ui(screen, snap.air)
 
-        if self.level_intro_active:
+        if snap.intro:
             self._draw_level_intro(screen)
 
-    def _draw_ui(self, screen: pygame.Surface) -> None:
+    def _draw_ui(self, screen: pygame.Surface, air: int) -> None:
         x = UI_PADDING
         y = UI_PADDING
         pygame.draw.rect(screen, (20, 20, 20), (x - 2, y - 2, UI_BAR_W + 4, UI_BAR_H + 4))
         pygame.draw.rect(screen, (60, 60, 60), (x, y, UI_BAR_W, UI_BAR_H))
-        fill = int((self.air / AIR_MAX) * UI_BAR_W)
+        fill = int((air / AIR_MAX) * UI_BAR_W)
         pygame.draw.rect(screen, (120, 220, 120), (x, y, fill, UI_BAR_H))
 
-        txt = self.font.render(f"Air: {self.air}/{AIR_MAX}  Target: {self.target_air}", True, (255, 255, 255))
+        txt = self.font.render(f"Air: {air}/{AIR_MAX}  Target: {self.target_air}", True, (255, 255, 255))
         screen.blit(txt, (x, y + UI_BAR_H + 6))
 
-        lvl = self.font.render(f"Level {self.level_id}", True, (255, 255, 255))
+        lvl = self.font.render(self._title(), True, (255, 255, 255))
         screen.blit(lvl, (SCREEN_W - lvl.get_width() - UI_PADDING, UI_PADDING))
 
-        hint = self.font.render("SPACE: pick up   N: skip (dev)", True, (230, 230, 230))
+        hint = self.font.render("SPACE: pick up   N: skip (dev)   B: bot (dev)", True, (230, 230, 230))
         screen.blit(hint, (UI_PADDING, SCREEN_H - 26))
 
     def _draw_level_intro(self, screen: pygame.Surface) -> None:
@@ -583,7 +1084,7 @@ class LevelState(BaseState):
         pygame.draw.rect(screen, (30, 30, 30), box)
         pygame.draw.rect(screen, (255, 255, 255), box, 2)
 
-        title = self.big_font.render(f"Level {self.level_id}", True, (255, 255, 255))
+        title = self.big_font.render(self._title(), True, (255, 255, 255))
         screen.blit(title, (box.x + 18, box.y + 16))
 
         pickups = sorted(self.air_pickup.items(), key=lambda kv: -int(kv[1]))
@@ -615,5 +1116,28 @@ class LevelState(BaseState):
             screen.blit(surf, (box.x + 18, y))
             y += 24
 
-    def next_state(self) -> BaseState | None:
+    def _title(self) -> str:
+        return f"Level {self.level_id}"
+
+    def next_state(self) -> StateFactory | None:
         return self._next
+
+    def teardown(self) -> None:
+        # main() has the next state's factory now; unlink it and let go of our surfaces.
+        self._next = None
+        self._broadphase.clear()
+        self._expiry.clear()
+        self.items.clear()
+        self.moving_obstacles.clear()
+        self.static_objects.clear()
+        self.map.release()
+        self.player_anims.clear()
+        self.nav_field = None
+        self.particles.clear()
+        self.fog_surface = None
+
+    def idle_timeout(self) -> float | None:
+        # The intro overlay is static until the player dismisses it.
+        if self.level_intro_active:
+            return math.inf
+        return None
@@ -1,16 +1,21 @@
 
 from __future__ import annotations
 
+import math
+from functools import partial
+
 import pygame
 
-from states.base_state import BaseState
+from states.base_state import BaseState, StateFactory
 from settings import SCREEN_W, SCREEN_H, TITLE_BG, FONTS_DIR
-from assets import load_image, load_font
+from assets import load_image, load_font, prefetch_group
 
 
 class TitleState(BaseState):
+    BLINK_INTERVAL = 0.5
+
     def __init__(self) -> None:
-        self._next: BaseState | None = None
+        self._next: StateFactory | None = None
 
         self.bg: pygame.Surface | None = None
         try:
@@ -25,28 +30,46 @@ class TitleState(BaseState):
         self.blink_t = 0.0
         self.show_press = True
 
+        # Level 1's bundled bytes come in while the title screen waits for ENTER.
+        prefetch_group("level1")
+
     def handle_event(self, event: pygame.event.Event) -> None:
         if event.type != pygame.KEYDOWN:
             return
 
         if event.key == pygame.K_RETURN:
             from states.level_state import LevelState
-            self._next = LevelState(level_id=1)
+            self._next = partial(LevelState, level_id=1)
+
+        elif event.key == pygame.K_e:
+            from states.endless_state import EndlessState
+            self._next = EndlessState
 
         elif event.key == pygame.K_ESCAPE:
             pygame.event.post(pygame.event.Event(pygame.QUIT))
 
     def update(self, dt: float) -> None:
         self.blink_t += dt
-        if self.blink_t >= 0.5:
+        if self.blink_t >= self.BLINK_INTERVAL:
             self.blink_t = 0.0
             self.show_press = not self.show_press
 
+    def idle_timeout(self) -> float | None:
+        # The screen is static (the blink is not drawn), so sleep until there is input.
+        return math.inf
+
     def draw(self, screen: pygame.Surface) -> None:
         if self.bg:
             screen.blit(self.bg, (0, 0))
         else:
             screen.fill((10, 10, 20)) 
 
-    def next_state(self) -> BaseState | None:
+        hint = self.font_small.render("E: endless mode", True, (240, 240, 240))
+        screen.blit(hint, (SCREEN_W - hint.get_width() - 16, SCREEN_H - hint.get_height() - 12))
+
+    def next_state(self) -> StateFactory | None:
         return self._next
+
+    def teardown(self) -> None:
+        self._next = None
+        self.bg = None
@@ -0,0 +1,156 @@
+# telemetry.py
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+
+class TelemetrySink:
+    """
+    Session events in a bounded in-memory ring buffer, appended to an NDJSON file in
+    batches. emit() is a deque append; JSON encoding and file I/O happen on a
+    background thread, once per batch. If the buffer overflows between flushes the
+    oldest events are dropped (and counted) instead of memory growing. Once the file
+    would pass `max_bytes` it is rotated to `<path>.1` (replacing the previous one), so
+    disk use stays under twice that however long the game runs.
+    """
+    def __init__(self,
+                 path: str,
+                 capacity: int = 4096,
+                 batch: int = 256,
+                 flush_interval: float = 10.0,
+                 frame_window: float = 10.0,
+                 slow_frame_ms: float = 50.0,
+                 max_bytes: int = 4 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self.frame_window = frame_window
+        self.slow_frame_ms = slow_frame_ms
+
+        self._events: deque[tuple[float, str, dict]] = deque(maxlen=capacity)
+        self._t0 = time.monotonic()
+        self._last_flush = self._t0
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+
+        self._frame_ms: list[float] = []
+        self._frame_state = ""
+        self._window_start = self._t0
+
+    def emit(self, event: str, fields: dict) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append((time.monotonic() - self._t0, event, fields))
+
+    def frame(self, dt: float, state: str) -> None:
+        """Collects frame times; a percentile summary goes out once per frame_window."""
+        ms = dt * 1000.0
+        if state != self._frame_state:
+            self._close_window()
+            self._frame_state = state
+        self._frame_ms.append(ms)
+        if ms >= self.slow_frame_ms:
+            self.emit("slow_frame", {"ms": round(ms, 2), "state": state})
+        if time.monotonic() - self._window_start >= self.frame_window:
+            self._close_window()
+
+    def _close_window(self) -> None:
+        samples = sorted(self._frame_ms)
+        self._window_start = time.monotonic()
+        self._frame_ms = []
+        if not samples:
+            return
+        n = len(samples)
+        self.emit("frames", {
+            "state": self._frame_state,
+            "count": n,
+            "p50": round(samples[n // 2], 2),
+            "p90": round(samples[min(n - 1, n * 9 // 10)], 2),
+            "p99": round(samples[min(n - 1, n * 99 // 100)], 2),
+            "max": round(samples[-1], 2),
+        })
+
+    def maybe_flush(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and len(self._events) < self.batch and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        if not self._events:
+            return
+        # popleft() is atomic, so events emitted meanwhile (e.g. by the simulation
+        # thread in pipelined mode) simply wait for the next batch.
+        batch = [self._events.popleft() for _ in range(len(self._events))]
+        if self.dropped:
+            batch.append((now - self._t0, "dropped", {"events": self.dropped}))
+            self.dropped = 0
+
+        if sys.platform == "emscripten":
+            self._write(batch)
+            return
+        self.wait()
+        self._thread = threading.Thread(target=self._write, args=(batch,), daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._close_window()
+        self.emit("session_end", {})
+        self.maybe_flush(force=True)
+        self.wait()
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _write(self, batch: list[tuple[float, str, dict]]) -> None:
+        lines = [json.dumps({"t": round(t, 3), "event": event, **fields}, separators=(",", ":"))
+                 for t, event, fields in batch]
+        text = "\n".join(lines) + "\n"
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size and size + len(text) > self.max_bytes:
+            os.replace(self.path, self.path + ".1")
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(text)
+
+
+# The session's sink, if telemetry is on. Hooks call the module functions below, which
+# are no-ops otherwise.
+_SINK: TelemetrySink | None = None
+
+
+def start(path: str, **options) -> TelemetrySink:
+    global _SINK
+    _SINK = TelemetrySink(path, **options)
+    _SINK.emit("session_start", {"wall": round(time.time(), 3), "platform": sys.platform})
+    return _SINK
+
+
+def stop() -> None:
+    global _SINK
+    if _SINK is not None:
+        _SINK.close()
+        _SINK = None
+
+
+def emit(event: str, **fields) -> None:
+    if _SINK is not None:
+        _SINK.emit(event, fields)
+
+
+def frame(dt: float, state: str) -> None:
+    if _SINK is not None:
+        _SINK.frame(dt, state)
+
+
+def flush(force: bool = False) -> None:
+    if _SINK is not None:
+        _SINK.maybe_flush(force)
@@ -0,0 +1,24 @@
+# tests/conftest.py
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def display():
+    """Asset paths are relative to the repo root, and loading needs a display mode."""
+    os.chdir(ROOT)
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((960, 540))
+    yield screen
+    pygame.quit()
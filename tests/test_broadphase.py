@@ -0,0 +1,35 @@
+# tests/test_broadphase.py
+from __future__ import annotations
+
+import pygame
+
+from game.broadphase import SweepAndPrune, TAG_PICKUP, TAG_HAZARD
+
+
+class Box:
+    def __init__(self, x: int, tag: int = TAG_PICKUP) -> None:
+        self.rect = pygame.Rect(x, 0, 10, 10)
+        self.tag = tag
+
+
+def test_query_filters_by_rect_and_tag():
+    bp = SweepAndPrune()
+    boxes = [Box(x, TAG_HAZARD if x == 40 else TAG_PICKUP) for x in (0, 20, 40, 60)]
+    for b in boxes:
+        bp.add(b)
+    bp.update()
+    assert bp.query(pygame.Rect(15, 0, 30, 10)) == [boxes[1], boxes[2]]
+    assert bp.query(pygame.Rect(15, 0, 30, 10), TAG_HAZARD) == [boxes[2]]
+
+
+def test_remove_keeps_queries_valid_before_update():
+    bp = SweepAndPrune()
+    boxes = [Box(x) for x in (0, 20, 40, 60)]
+    for b in boxes:
+        bp.add(b)
+    bp.update()
+    bp.remove(boxes[1])
+    assert bp.query(pygame.Rect(55, 0, 10, 10)) == [boxes[3]]
+    assert bp.query(pygame.Rect(0, 0, 100, 10)) == [boxes[0], boxes[2], boxes[3]]
+    bp.remove(boxes[1])  # already gone: no-op
+    assert len(bp) == 3
@@ -0,0 +1,47 @@
+# tests/test_collision.py
+from __future__ import annotations
+
+import pygame
+import pytest
+
+from game.collision import clip_move, overlaps, sweep_aabb
+
+
+def test_sweep_hits_a_thin_wall_a_long_step_would_skip():
+    player = pygame.Rect(0, 0, 32, 32)
+    wall = pygame.Rect(100, 0, 4, 32)
+    assert not player.move(200, 0).colliderect(wall)
+    assert sweep_aabb(player, 200, 0, wall) == pytest.approx(68 / 200)
+
+
+def test_sweep_misses_and_overlap():
+    player = pygame.Rect(0, 0, 32, 32)
+    assert sweep_aabb(player, 200, 0, pygame.Rect(100, 40, 4, 32)) is None
+    assert sweep_aabb(player, -50, 0, pygame.Rect(100, 0, 4, 32)) is None
+    assert sweep_aabb(player, 10, 0, pygame.Rect(20, 20, 32, 32)) == 0.0
+
+
+def test_clip_move_stops_flush_and_slides():
+    walls = [pygame.Rect(100, 0, 10, 200)]
+    player = pygame.Rect(40, 50, 32, 32)
+    assert clip_move(player, 200, 0, walls) == (28, 0)
+    assert clip_move(player, 200, 40, walls) == (28, 40)  # blocked on x, slides on y
+    assert clip_move(player, -30, 0, walls) == (-30, 0)
+
+
+def test_clip_move_lets_an_overlapping_rect_back_out():
+    walls = [pygame.Rect(100, 0, 10, 200)]
+    stuck = pygame.Rect(90, 50, 32, 32)
+    assert clip_move(stuck, -20, 0, walls) == (-20, 0)
+
+
+def test_overlaps_uses_masks_once_rects_touch():
+    a = pygame.Rect(0, 0, 10, 10)
+    b = pygame.Rect(8, 8, 10, 10)
+    empty_corner = pygame.mask.Mask((10, 10), fill=True)
+    for x in range(5, 10):
+        for y in range(5, 10):
+            empty_corner.set_at((x, y), 0)
+    assert overlaps(a, None, b, None)
+    assert not overlaps(a, empty_corner, b, None)
+    assert not overlaps(a, None, pygame.Rect(20, 20, 5, 5), None)
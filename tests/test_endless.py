@@ -0,0 +1,80 @@
+# tests/test_endless.py
+from __future__ import annotations
+
+import copy
+import random
+from itertools import islice
+
+from settings import AIR_MAX, ENDLESS_FLOW_AREA
+from game.level_data import LEVELS
+from game.endless import endless_waves, wave_templates
+
+
+def _waves(seed: int, templates=None, plateau: int = 12):
+    return endless_waves(templates or wave_templates(LEVELS), seed, ENDLESS_FLOW_AREA, plateau=plateau)
+
+
+def test_same_seed_same_waves_and_no_template_twice_in_a_row():
+    waves = list(islice(_waves(7), 200))
+    assert waves == list(islice(_waves(7), 200))
+    assert [w["wave"] for w in waves] == list(range(200))
+    for a, b in zip(waves, waves[1:]):
+        assert a["template"] != b["template"]
+    assert {w["template"] for w in waves} == set(LEVELS)
+
+
+def test_difficulty_ramps_then_plateaus():
+    templates = [(1, {"max_items": 4, "air_rules": {"step_on": {"net": -8}},
+                      "item_spawn": {"weights": {"net": 2.0}}})]
+    waves = list(islice(_waves(3, templates, plateau=9), 20))
+
+    items = [w["max_items"] for w in waves]
+    targets = [w["target_air"] for w in waves]
+    hazards = [w["item_spawn"]["weights"]["net"] for w in waves]
+    for series in (items, targets, hazards):
+        assert series == sorted(series)
+        assert len(set(series[9:])) == 1
+    assert items[0] == 4 and items[-1] == 4 + 9 // 3
+    assert hazards[0] == 2.0
+    assert max(targets) <= AIR_MAX
+    # A single template is allowed to repeat; there is nothing else to pick.
+    assert {w["template"] for w in waves} == {1}
+
+
+def test_pipeline_is_lazy():
+    copies = []
+
+    class Rules(dict):
+        def __deepcopy__(self, memo):
+            copies.append(1)
+            return copy.deepcopy(dict(self), memo)
+
+    waves = _waves(1, [(1, Rules(max_items=3)), (2, Rules(max_items=5))])
+    assert not copies
+    next(waves)
+    assert len(copies) == 1
+    list(islice(waves, 4))
+    assert len(copies) == 5
+
+
+def test_wave_switch_waits_for_the_main_thread():
+    import assets
+    from states.endless_state import EndlessState
+
+    random.seed(2)
+    state = EndlessState()
+    state.level_intro_active = False
+    try:
+        state.air = state.target_air
+        cached = set(assets._IMAGE_CACHE)
+        state.update(1 / 60)
+        assert state.wave == 0
+        assert set(assets._IMAGE_CACHE) == cached
+
+        state.after_update()
+        assert state.wave == 1
+        state.update(1 / 60)
+        state.after_update()
+        assert state.wave == 1
+    finally:
+        state.teardown()
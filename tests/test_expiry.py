@@ -0,0 +1,41 @@
+# tests/test_expiry.py
+from __future__ import annotations
+
+from game.expiry import ExpiryQueue
+
+
+class Thing:
+    pass
+
+
+def test_pops_in_expiry_order_up_to_now():
+    q: ExpiryQueue[Thing] = ExpiryQueue()
+    a, b, c = Thing(), Thing(), Thing()
+    q.push(b, 2.0)
+    q.push(a, 1.0)
+    q.push(c, 3.0)
+    assert q.pop_expired(0.5) == []
+    assert q.pop_expired(2.0) == [a, b]
+    assert len(q) == 1
+    assert q.pop_expired(10.0) == [c]
+    assert len(q) == 0
+
+
+def test_discarded_and_untimed_objects_never_expire():
+    q: ExpiryQueue[Thing] = ExpiryQueue()
+    a, b, forever = Thing(), Thing(), Thing()
+    q.push(a, 1.0)
+    q.push(b, 1.0)
+    q.push(forever, None)
+    q.discard(a)
+    q.discard(a)  # twice is fine
+    assert len(q) == 1
+    assert q.pop_expired(5.0) == [b]
+
+
+def test_equal_times_keep_push_order():
+    q: ExpiryQueue[Thing] = ExpiryQueue()
+    things = [Thing() for _ in range(5)]
+    for t in things:
+        q.push(t, 1.0)
+    assert q.pop_expired(1.0) == things
@@ -0,0 +1,64 @@
+# tests/test_level_state.py
+from __future__ import annotations
+
+import random
+
+import pygame
+
+from game.broadphase import TAG_CAR
+from game.collision import overlaps
+from states.level_state import LevelState
+
+
+def _car_level() -> tuple[LevelState, object]:
+    random.seed(11)
+    state = LevelState(2)
+    state.level_intro_active = False
+    car = next(mo for mo in state.moving_obstacles if mo.tag == TAG_CAR)
+    return state, car
+
+
+def test_car_margin_contact_is_not_a_hit():
+    state, car = _car_level()
+    mask = state._player_mask()
+    size = state.player.rect.size
+    # A player position whose rect overlaps the car's but whose pixels don't.
+    spot = next(r for dx in range(-40, 40) for dy in range(-40, 40)
+                for r in [pygame.Rect(car.rect.x + dx, car.rect.y + dy, *size)]
+                if r.colliderect(car.rect) and not overlaps(r, mask, car.rect, car.mask))
+    car.prev_rect = car.rect.copy()
+    state.player.rect = spot.copy()
+    assert not state._swept_car_hit(spot.copy())
+
+
+def test_car_jumping_over_the_player_is_a_hit():
+    state, car = _car_level()
+    player = pygame.Rect(400, 300, *state.player.rect.size)
+    state.player.rect = player.copy()
+    car.prev_rect = pygame.Rect(player.x - 200, player.y, *car.rect.size)
+    car.rect = pygame.Rect(player.x + 200, player.y, *car.rect.size)
+    assert not car.rect.colliderect(player)
+    assert state._swept_car_hit(player.copy())
+
+
+def test_long_step_stops_at_walls():
+    random.seed(2)
+    state = LevelState(2)
+    rng = random.Random(4)
+    for _ in range(300):
+        direction = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1), (0.7, 0.7), (-0.7, -0.7)])
+        state.player.move(0.5, *direction, state.collision_rects)
+        assert state.player.rect.collidelist(state.collision_rects) == -1
+
+
+def test_reload_config_rerolls_item_lifetimes():
+    random.seed(5)
+    state = LevelState(1)
+    assert state.items
+    state.cfg = {**state.cfg, "item_lifetime": (100.0, 100.0)}
+    state._level_config = lambda: (state.cfg, state.spawn_table)
+    state.reload_config({"item_lifetime"})
+    for it in state.items:
+        assert it.lifetime == 100.0
+        assert it.expires_at == it.spawn_time + 100.0
+    state.teardown()
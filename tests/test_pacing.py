@@ -0,0 +1,27 @@
+# tests/test_pacing.py
+from __future__ import annotations
+
+import asyncio
+import time
+
+from pacing import FrameScheduler
+
+
+def test_resync_does_not_hand_the_idle_wait_to_the_next_frame():
+    async def run() -> float:
+        scheduler = FrameScheduler(60)
+        for _ in range(3):
+            await scheduler.wait()
+        time.sleep(0.2)  # blocked on input while idle
+        scheduler.resync()
+        return await scheduler.wait()
+
+    assert asyncio.run(run()) < 0.1
+
+
+def test_steps_drop_the_backlog_past_max_steps():
+    scheduler = FrameScheduler(60, update_hz=30, max_steps=5)
+    assert scheduler.steps(1 / 30) == [1 / 30]
+    assert len(scheduler.steps(10.0)) == 5
+    assert scheduler.dropped_steps > 0
+    assert scheduler.steps(1 / 60) == []
@@ -0,0 +1,44 @@
+# tests/test_savestate.py
+from __future__ import annotations
+
+import random
+
+import savestate
+from game.broadphase import TAG_CAR
+from states.level_state import LevelState
+
+
+def _level(level_id: int) -> LevelState:
+    random.seed(7)
+    state = LevelState(level_id)
+    state.level_intro_active = False
+    return state
+
+
+def test_round_trip_restores_state():
+    state = _level(1)
+    for _ in range(90):
+        state.update(1 / 60)
+    restored = savestate.decode(savestate.encode(state))
+
+    assert restored.level_id == state.level_id
+    assert restored.air == state.air
+    assert restored.t == state.t
+    assert restored.player.rect == state.player.rect
+    assert [(it.kind, it.rect) for it in restored.items] == [(it.kind, it.rect) for it in state.items]
+    # Same rng state: both sides go on to spawn the same things.
+    assert restored.rng.random() == state.rng.random()
+
+
+def test_reversed_car_restores_its_facing():
+    state = _level(2)
+    car = next(mo for mo in state.moving_obstacles if mo.tag == TAG_CAR and mo.vx != 0)
+    car.vx = -car.vx
+    car.face()
+    assert car.image is car.frames[(True, False)]
+
+    restored = savestate.decode(savestate.encode(state))
+    again = next(mo for mo in restored.moving_obstacles if mo.index == car.index)
+    assert again.vx == car.vx
+    assert again.image is again.frames[(True, False)]
+    assert again.mask is again.masks[(True, False)]
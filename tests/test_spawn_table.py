@@ -0,0 +1,46 @@
+# tests/test_spawn_table.py
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import pytest
+
+from game.level_data import LEVELS
+from game.spawn_table import AliasTable, compile_spawn_table
+
+
+def test_alias_table_matches_weights():
+    weights = [1.0, 3.0, 0.0, 6.0]
+    table = AliasTable(weights)
+    rng = random.Random(3)
+    n = 100_000
+    counts = Counter(table.sample(rng) for _ in range(n))
+    assert counts[2] == 0
+    for i, w in enumerate(weights):
+        assert counts[i] / n == pytest.approx(w / sum(weights), abs=0.01)
+
+
+def test_alias_table_rejects_bad_weights():
+    with pytest.raises(ValueError):
+        AliasTable([])
+    with pytest.raises(ValueError):
+        AliasTable([0.0, 0.0])
+    with pytest.raises(ValueError):
+        AliasTable([1.0, -1.0])
+
+
+def test_compile_drops_zero_weight_kinds_and_adds_air_rule_kinds():
+    cfg = {
+        "item_spawn": {"types": ["can", "leaf"], "weights": {"leaf": 0}},
+        "air_rules": {"pickup": {"can": 3, "bottle": 2}, "step_on": {"net": -8}},
+    }
+    table = compile_spawn_table(cfg)
+    assert table.kinds == ["can", "bottle", "net"]
+    assert compile_spawn_table({"item_spawn": {"types": ["a"], "weights": {"a": 0}}}) is None
+
+
+def test_every_level_compiles():
+    for level_id, cfg in LEVELS.items():
+        table = compile_spawn_table(cfg)
+        assert table is not None and table.kinds, level_id